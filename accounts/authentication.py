@@ -0,0 +1,131 @@
+# accounts/authentication.py
+import threading
+import time
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+
+class ClaimsUser(TokenUser):
+    """
+    request.user built from access-token claims (user_id, username); role
+    and is_staff come from the short-lived account cache below.
+
+    Attributes not carried by the token (email, phone, the Role row...) load
+    the real User on first access, once per request. Views using this should
+    filter by `user_id=request.user.id` rather than passing the object to the ORM.
+    """
+
+    @cached_property
+    def id(self):
+        # SimpleJWT stores the claim as a string; keep ids comparable to User.pk
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def role_name(self):
+        # Not the "role" claim: it outlives a demotion for the refresh token's lifetime
+        return current_role(self.id)
+
+    @cached_property
+    def is_staff(self):
+        state = account_state(self.id)
+        return bool(state and state[2])
+
+    @cached_property
+    def username(self):
+        return self.token.get("username") or self.user.username
+
+    @cached_property
+    def user(self):
+        return User.objects.select_related("role").get(pk=self.id)
+
+    def __str__(self):
+        return str(self.user)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.user, attr)
+
+
+_accounts = {}  # user_id -> ((is_active, role name, is_staff) or None, expires_at)
+_accounts_lock = threading.Lock()
+_ACCOUNTS_MAX_ENTRIES = 10000
+
+
+def _cache_seconds():
+    return getattr(settings, "TOKEN_USER_REVOCATION_CACHE_SECONDS", 30)
+
+
+def account_state(user_id):
+    """
+    (is_active, role name, is_staff) of the user behind a token, None if the
+    row is gone. Answers are cached per process for
+    TOKEN_USER_REVOCATION_CACHE_SECONDS, so an active user costs at most one
+    small query per window, and a disabled, demoted or removed account loses
+    access within that window whatever its tokens still claim.
+    """
+    now = time.monotonic()
+    entry = _accounts.get(user_id)
+    if entry and entry[1] > now:
+        return entry[0]
+
+    row = User.objects.filter(pk=user_id).values_list("is_active", "role__name", "is_staff").first()
+    state = (row[0], row[1] or "", row[2]) if row else None
+    with _accounts_lock:
+        if len(_accounts) >= _ACCOUNTS_MAX_ENTRIES:
+            _accounts.clear()
+        _accounts[user_id] = (state, now + _cache_seconds())
+    return state
+
+
+def is_revoked(user_id):
+    """
+    True if the account behind a still-valid token was disabled or removed.
+    """
+    state = account_state(user_id)
+    return state is None or not state[0]
+
+
+def current_role(user_id):
+    """
+    The user's role name as of at most TOKEN_USER_REVOCATION_CACHE_SECONDS ago.
+    """
+    state = account_state(user_id)
+    return state[1] if state else ""
+
+
+def forget_revocation(user_id):
+    """
+    Drop the cached answer for a user (called when the User row changes).
+    """
+    with _accounts_lock:
+        _accounts.pop(user_id, None)
+
+
+class TokenUserAuthentication(JWTStatelessUserAuthentication):
+    """
+    Opt-in alternative to JWTAuthentication for hot endpoints: request.user
+    is a ClaimsUser instead of a User row loaded on every request.
+
+    Logout still works as before (the refresh token is blacklisted, so no new
+    access tokens); disabled accounts are rejected through is_revoked().
+    """
+
+    def get_user(self, validated_token):
+        user = ClaimsUser(super().get_user(validated_token).token)
+        if is_revoked(user.id):
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
@@ -0,0 +1,17 @@
+# accounts/hashers.py
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2-SHA256 hasher with the iteration count taken from
+    settings.PASSWORD_HASH_ITERATIONS.
+
+    Same algorithm name, so existing hashes verify unchanged; must_update()
+    flags hashes made with another cost and login rewrites them.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_HASH_ITERATIONS", PBKDF2PasswordHasher.iterations)
@@ -0,0 +1,69 @@
+# accounts/hashing.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class HashingBusy(Exception):
+    """
+    Raised when every hashing worker is busy and the wait queue is full.
+    Views answer 503 + Retry-After instead of tying up another worker.
+    """
+
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+def _pool():
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = getattr(settings, "PASSWORD_HASH_WORKERS", 2)
+                queue = getattr(settings, "PASSWORD_HASH_QUEUE", 16)
+                _slots = threading.BoundedSemaphore(workers + queue)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+    return _executor, _slots
+
+
+def run(fn, *args):
+    """
+    Run a hashing call on the shared pool and wait for it.
+
+    At most PASSWORD_HASH_WORKERS hashes burn CPU at once, however many
+    request threads are logging in, so slot/catalog requests keep their share.
+    """
+    executor, slots = _pool()
+    if not slots.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        slots.release()
+
+
+def make_password(raw_password):
+    if raw_password is None:
+        return hashers.make_password(None)  # unusable password, nothing to hash
+    return run(hashers.make_password, raw_password)
+
+
+def _verify(raw_password, encoded):
+    rehashed = []
+    is_correct = hashers.check_password(
+        raw_password, encoded,
+        setter=lambda raw: rehashed.append(hashers.make_password(raw)),
+    )
+    return is_correct, (rehashed[0] if rehashed else None)
+
+
+def verify_password(raw_password, encoded):
+    """
+    Returns (is_correct, new_encoded). new_encoded is set when the stored hash
+    used an outdated hasher/cost and has been recomputed in the same job.
+    """
+    return run(_verify, raw_password, encoded)
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_profiles(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    CustomerProfile = apps.get_model('accounts', 'CustomerProfile')
+
+    def tier_for(total):
+        if total >= 10:
+            return 'gold'
+        if total >= 5:
+            return 'silver'
+        return 'bronze'
+
+    users = User.objects.annotate(
+        total=Count('bookings'),
+        last=Max('bookings__created_at'),
+    ).values_list('id', 'total', 'last')
+
+    CustomerProfile.objects.bulk_create(
+        [
+            CustomerProfile(user_id=user_id, total_bookings=total, last_visit=last, loyalty_tier=tier_for(total))
+            for user_id, total, last in users
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_role_alter_user_role'),
+        ('booking', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_bookings', models.PositiveIntegerField(default=0)),
+                ('last_visit', models.DateTimeField(blank=True, null=True)),
+                ('loyalty_tier', models.CharField(choices=[('gold', 'Gold'), ('silver', 'Silver'), ('bronze', 'Bronze')], default='bronze', max_length=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='customer_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['loyalty_tier', '-total_bookings'], name='accounts_cu_loyalty_a6761a_idx'), models.Index(fields=['-total_bookings'], name='accounts_cu_total_b_18312e_idx'), models.Index(fields=['-last_visit'], name='accounts_cu_last_vi_fdc890_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_profiles, migrations.RunPython.noop),
+    ]
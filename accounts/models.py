@@ -1,4 +1,6 @@
+from django.apps import apps
 from django.db import models
+from django.db.models import Count, Max
 from django.contrib.auth.models import (AbstractBaseUser,BaseUserManager,PermissionsMixin)
 from django.utils import timezone
 
@@ -63,5 +65,66 @@ class User(AbstractBaseUser, PermissionsMixin):
         return f"{self.username} ({self.role})"
 
 
+# Customer Profile (denormalised booking stats for the admin dashboard)
 
+LOYALTY_GOLD_BOOKINGS = 10
+LOYALTY_SILVER_BOOKINGS = 5
 
+
+class CustomerProfile(models.Model):
+    TIER_CHOICES = (
+        ('gold', 'Gold'),
+        ('silver', 'Silver'),
+        ('bronze', 'Bronze'),
+    )
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='customer_profile')
+    total_bookings = models.PositiveIntegerField(default=0)
+    last_visit = models.DateTimeField(blank=True, null=True)
+    loyalty_tier = models.CharField(max_length=10, choices=TIER_CHOICES, default='bronze')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['loyalty_tier', '-total_bookings']),
+            models.Index(fields=['-total_bookings']),
+            models.Index(fields=['-last_visit']),
+        ]
+
+    @staticmethod
+    def tier_for(total_bookings):
+        if total_bookings >= LOYALTY_GOLD_BOOKINGS:
+            return 'gold'
+        if total_bookings >= LOYALTY_SILVER_BOOKINGS:
+            return 'silver'
+        return 'bronze'
+
+    @classmethod
+    def refresh_for(cls, user_id, create=True):
+        """
+        Recount one customer's bookings, live and archived (both indexed on
+        user), and store the result.
+        create=False only updates an existing row (used while deleting, when
+        the user itself may be on its way out).
+        """
+        total, last_visit = 0, None
+        # Live and archived bookings both count towards the customer's history
+        for model_name in ('Booking', 'ArchivedBooking'):
+            stats = apps.get_model('booking', model_name).objects.filter(user_id=user_id).aggregate(
+                total=Count('id'),
+                last_visit=Max('created_at'),
+            )
+            total += stats['total']
+            if stats['last_visit'] and (last_visit is None or stats['last_visit'] > last_visit):
+                last_visit = stats['last_visit']
+
+        values = {
+            'total_bookings': total,
+            'last_visit': last_visit,
+            'loyalty_tier': cls.tier_for(total),
+        }
+        updated = cls.objects.filter(user_id=user_id).update(**values)
+        if not updated and create:
+            cls.objects.create(user_id=user_id, **values)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.total_bookings} bookings ({self.loyalty_tier})"
@@ -9,12 +9,25 @@
 #             return request.user.is_authenticated and request.user.role == 'user'
 from rest_framework.permissions import BasePermission
 
+from .authentication import current_role
+
+
+def _role_name(request):
+    """
+    Role of the authenticated user, checked against the database through the
+    per-process account cache (at most TOKEN_USER_REVOCATION_CACHE_SECONDS
+    old). The token's "role" claim is not trusted: a refresh token keeps
+    minting access tokens with it for a day after a demotion.
+    """
+    return current_role(request.user.id).lower()
+
+
 class IsAdmin(BasePermission):
     """
     Allows access only to admin users (is_staff=True).
     """
     def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and getattr(request.user.role, 'name', '').lower() == 'admin')
+        return bool(request.user and request.user.is_authenticated and _role_name(request) == 'admin')
 
 
 class IsUser(BasePermission):
@@ -22,4 +35,4 @@ class IsUser(BasePermission):
     Allows access only to normal authenticated users (is_staff=False).
     """
     def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and getattr(request.user.role, 'name', '').lower() == 'user')
+        return bool(request.user and request.user.is_authenticated and _role_name(request) == 'user')
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from .models import User, Role
+from . import hashing
 from django.db.models import Q
 
 
@@ -36,9 +37,13 @@ class RegisterSerializer(serializers.ModelSerializer):
          # Remove confirm_password before creating user
         validated_data.pop('confirm_password', None)
         password = validated_data.pop('password', None)
+        # Hashed on the bounded pool before anything is written; may raise HashingBusy
+        encoded = hashing.make_password(password)
         role_name = self.context.get('role_name', 'user')
         role_obj, _ = Role.objects.get_or_create(name=role_name)
-        user = User.objects.create_user(**validated_data, password=password, role=role_obj)
+        user = User.objects.create_user(**validated_data, password=None, role=role_obj)
+        user.password = encoded
+        user.save(update_fields=["password"])
         return user
 
 
@@ -0,0 +1,70 @@
+# accounts/signals.py
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import CustomerProfile
+from .authentication import forget_revocation
+from backend.conditional import bump
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_customer_profile(sender, instance, created, **kwargs):
+    if created:
+        CustomerProfile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def reset_token_user_revocation(sender, instance, **kwargs):
+    forget_revocation(instance.pk)
+    bump("users")
+
+
+_state = threading.local()
+
+
+def _refresh_profile(user_id, create=True):
+    pending = getattr(_state, "pending", None)
+    if pending is not None:
+        pending[user_id] = pending.get(user_id, False) or create
+        return
+    CustomerProfile.refresh_for(user_id, create=create)
+
+
+@contextmanager
+def deferred_profile_refresh():
+    """
+    Bulk booking changes (e.g. archiving): recount each touched customer
+    once on exit instead of once per booking.
+    """
+    if getattr(_state, "pending", None) is not None:
+        yield
+        return
+
+    _state.pending = {}
+    try:
+        yield
+    finally:
+        pending = _state.pending
+        _state.pending = None
+    for user_id, create in pending.items():
+        CustomerProfile.refresh_for(user_id, create=create)
+
+
+@receiver(post_save, sender='booking.Booking')
+def refresh_profile_on_booking_save(sender, instance, created, update_fields=None, **kwargs):
+    """
+    New booking or status change → recount that customer's stats.
+    Saves that only touch totals (calculate_totals) are skipped.
+    """
+    if created or update_fields is None or 'status' in update_fields:
+        _refresh_profile(instance.user_id)
+
+
+@receiver(post_delete, sender='booking.Booking')
+def refresh_profile_on_booking_delete(sender, instance, **kwargs):
+    _refresh_profile(instance.user_id, create=False)
@@ -5,6 +5,7 @@ from .views import (
      LogoutView,
     ProfileView,
     AdminCustomersDashboardView,
+    AdminThrottleMetricsView,
 )
 
 urlpatterns = [
@@ -15,6 +16,7 @@ urlpatterns = [
 
     # Admin APIs
     path('admin/register/', AdminRegisterView.as_view(), name='admin_register'),
+    path('admin/throttle-metrics/', AdminThrottleMetricsView.as_view(), name='admin_throttle_metrics'),
     # path('admin/login/', LoginView.as_view(), name='admin_login'),
 
     # Common
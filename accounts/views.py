@@ -7,15 +7,35 @@ from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import status
 from booking.models import Booking
-from .models import User
-from django.db.models import Count, Max  
+from rest_framework.pagination import PageNumberPagination
+from .models import User, CustomerProfile
+from . import hashing
+from .hashing import HashingBusy
+from django.db.models import Count, Q
 from .serializers import RegisterSerializer, LoginSerializer, UserSerializer
 from .permissions import IsAdmin, IsUser
+from backend.conditional import conditional_get
+from backend.throttling import AuthRateThrottle, ThrottleBeforeAuthMixin, throttle_metrics
+from django.conf import settings
+from rest_framework.settings import api_settings
+
+
+def hashing_busy_response():
+    # Password hashing pool is saturated (e.g. registration spike): shed load
+    return Response(
+        {"error": "Too many sign-in requests right now, please retry shortly"},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "2"},
+    )
 
 
 # Helper function to create JWT tokens
 def get_tokens_for_user(user):
     refresh = RefreshToken.for_user(user)
+    # Copied into the access token for clients; IsAdmin/IsUser re-check the
+    # role against the database (accounts.authentication.current_role)
+    refresh["role"] = user.role.name
+    refresh["is_staff"] = user.is_staff
     return {
         'refresh': str(refresh),
         'access': str(refresh.access_token),
@@ -25,15 +45,19 @@ def get_tokens_for_user(user):
 
 #USER REGISTRATION & LOGIN
 
-class UserRegisterView(APIView):
+class UserRegisterView(ThrottleBeforeAuthMixin, APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [AuthRateThrottle]
 
     def post(self, request):
         
         # data['role'] = 'user'
         serializer = RegisterSerializer(data=request.data, context={'role_name': 'user'})
         if serializer.is_valid():
-            serializer.save()
+            try:
+                serializer.save()
+            except HashingBusy:
+                return hashing_busy_response()
             return Response(
                  {"message": "User registered successfully"},
                  status=status.HTTP_201_CREATED
@@ -41,8 +65,9 @@ class UserRegisterView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 
-class LoginView(APIView):
+class LoginView(ThrottleBeforeAuthMixin, APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [AuthRateThrottle]
 
     def post(self, request):
         email_or_username = request.data.get("email_or_username")
@@ -51,26 +76,36 @@ class LoginView(APIView):
         if not email_or_username or not password:
             return Response({"error": "email_or_username and password required"}, status=400)
 
-        # Try email
+        # Email or username in one query (email match wins), role joined in
+        candidates = list(
+            User.objects.select_related("role")
+            .filter(Q(email=email_or_username) | Q(username=email_or_username))[:2]
+        )
+        user = next((u for u in candidates if u.email == email_or_username), None)
+        if user is None and candidates:
+            user = candidates[0]
+
         try:
-            user = User.objects.get(email=email_or_username)
-        except User.DoesNotExist:
-            # Try username
-            try:
-                user = User.objects.get(username=email_or_username)
-            except User.DoesNotExist:
-                return Response({"error": "Invalid username/email or password"}, status=400)
+            valid, rehashed = (
+                hashing.verify_password(password, user.password) if user is not None else (False, None)
+            )
+        except HashingBusy:
+            return hashing_busy_response()
 
-        if not user.check_password(password):
+        if not valid:
             return Response({"error": "Invalid username/email or password"}, status=400)
 
+        if rehashed:
+            # Stored with an old cost/hasher: keep the upgraded hash
+            user.password = rehashed
+            user.save(update_fields=["password"])
+
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
-        access = refresh.access_token
+        tokens = get_tokens_for_user(user)
 
         return Response({
-            "access": str(access),
-            "refresh": str(refresh),
+            "access": tokens["access"],
+            "refresh": tokens["refresh"],
             "user": {
                 "id": user.id,
                 "username": user.username,
@@ -105,14 +140,18 @@ class LogoutView(APIView):
 
 
 #ADMIN REGISTRATION & LOGIN
-class AdminRegisterView(APIView):
+class AdminRegisterView(ThrottleBeforeAuthMixin, APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [AuthRateThrottle]
 
     def post(self, request):
         # data['role'] = 'admin'    
         serializer = RegisterSerializer(data=request.data, context={'role_name': 'admin'})
         if serializer.is_valid():
-            user = serializer.save()
+            try:
+                user = serializer.save()
+            except HashingBusy:
+                return hashing_busy_response()
             user.is_staff = True 
             user.save()
             return Response(
@@ -129,61 +168,90 @@ class ProfileView(APIView):
         return Response(serializer.data)
     
 
+class CustomerPagination(PageNumberPagination):
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
 class AdminCustomersDashboardView(APIView):
+    """
+    Customers with their booking stats, read from CustomerProfile.
+
+    Query params: tier (gold/silver/bronze), ordering (see ORDERING),
+    page, page_size.
+    """
     permission_classes = [permissions.IsAdminUser]
 
+    ORDERING = {
+        "-total_bookings": "-total_bookings",
+        "total_bookings": "total_bookings",
+        "-last_visit": "-last_visit",
+        "last_visit": "last_visit",
+        "name": "user__username",
+        "-name": "-user__username",
+    }
+
+    @conditional_get("bookings", "users")
     def get(self, request):
         # Only normal users (customers), not admins
-        users = (
-            User.objects
-            .filter(role__name="user", is_active=True)
-            .annotate(
-                total_bookings=Count("bookings"),
-                last_visit=Max("bookings__created_at")
-            )
-            .order_by("-total_bookings")
-        )
+        profiles = CustomerProfile.objects.filter(user__role__name="user", user__is_active=True)
 
-        customers_data = []
+        summary = profiles.aggregate(
+            total_customers=Count("id"),
+            gold_members=Count("id", filter=Q(loyalty_tier="gold")),
+            silver_members=Count("id", filter=Q(loyalty_tier="silver")),
+        )
 
-        gold_count = 0
-        silver_count = 0
+        tier = request.query_params.get("tier")
+        if tier:
+            profiles = profiles.filter(loyalty_tier=tier.lower())
 
-        for index, user in enumerate(users, start=1):
-            total = user.total_bookings or 0
+        ordering = request.query_params.get("ordering", "-total_bookings")
+        if ordering not in self.ORDERING:
+            return Response({"detail": f"ordering must be one of {', '.join(self.ORDERING)}"}, status=400)
+        profiles = profiles.select_related("user").order_by(self.ORDERING[ordering], "user_id")
 
-            # 🎖 Loyalty logic
-            if total >= 10:
-                loyalty = "Gold"
-                gold_count += 1
-            elif total >= 5:
-                loyalty = "Silver"
-                silver_count += 1
-            else:
-                loyalty = "Bronze"
+        paginator = CustomerPagination()
+        page = paginator.paginate_queryset(profiles, request, view=self)
+        offset = (paginator.page.number - 1) * paginator.page.paginator.per_page
 
+        customers_data = []
+        for index, profile in enumerate(page, start=offset + 1):
+            user = profile.user
             customers_data.append({
                 "customer_id": f"CUS{index:03d}",
                 "name": user.username,
                 "email": user.email,
                 "phone": user.phone,
-                "total_bookings": total,
+                "total_bookings": profile.total_bookings,
                 "last_visit": (
-                    user.last_visit.strftime("%d %b %Y")
-                    if user.last_visit else None
+                    profile.last_visit.strftime("%d %b %Y")
+                    if profile.last_visit else None
                 ),
-                "loyalty": loyalty,
+                "loyalty": profile.get_loyalty_tier_display(),
                 "user_id": user.id
             })
 
         response = {
+            "count": paginator.page.paginator.count,
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
             "customers": customers_data,
-            "summary": {
-                "total_customers": users.count(),
-                "gold_members": gold_count,
-                "silver_members": silver_count
-            }
+            "summary": summary,
         }
 
         return Response(response, status=200)
 
+
+class AdminThrottleMetricsView(APIView):
+    """
+    Allowed/throttled request counts per rate-limit scope.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "store": getattr(settings, "RATE_LIMIT_STORE", "local"),
+            "rates": api_settings.DEFAULT_THROTTLE_RATES,
+            "scopes": throttle_metrics(),
+        })
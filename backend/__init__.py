@@ -1,3 +1,4 @@
 from .celery import app as celery_app
+from . import sqlite  # noqa: F401  (connection_created hook)
 
 __all__ = ("celery_app",)
@@ -0,0 +1,20 @@
+# backend/middleware.py
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class ThresholdGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves small responses alone: below GZIP_MIN_BYTES
+    compression costs more CPU than it saves on the wire.
+    Images and other already-compressed media types are skipped as well.
+    """
+
+    skip_content_types = ("image/", "video/", "audio/", "application/zip", "application/gzip")
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < getattr(settings, "GZIP_MIN_BYTES", 1024):
+            return response
+        if response.get("Content-Type", "").startswith(self.skip_content_types):
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,127 @@
+# backend/serialization.py
+"""
+Lightweight read-only serialization for hot list endpoints.
+
+A ValuesSerializer is declared once per response shape as a dict of
+output key -> Field(lookup) / Nested({...}). The lookups are fetched with
+one values_list() query and every row is turned into a dict by mappers
+compiled up front, with no model instances or DRF field objects per row.
+The output matches the equivalent DRF ModelSerializer.
+"""
+from django.utils import timezone
+from rest_framework.response import Response
+
+
+def iso(value):
+    # date / time, as DRF's DateField/TimeField render them
+    return value.isoformat()
+
+
+def decimal_str(value):
+    # DRF's DecimalField default (COERCE_DECIMAL_TO_STRING)
+    return str(value)
+
+
+def datetime_iso(value):
+    # DRF's DateTimeField: current timezone, "Z" for UTC
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    text = value.isoformat()
+    if text.endswith("+00:00"):
+        text = text[:-6] + "Z"
+    return text
+
+
+class Field:
+    """
+    One output value. With a tuple of lookups, `convert` receives all of them
+    (None if the first is NULL).
+    """
+
+    def __init__(self, lookup, convert=None):
+        self.lookup = lookup
+        self.convert = convert
+
+
+class Nested:
+    """
+    A nested object; None when the `null_if` lookup is NULL (e.g. an empty FK).
+    """
+
+    def __init__(self, fields, null_if=None):
+        self.fields = fields
+        self.null_if = null_if
+
+
+class ValuesSerializer:
+    """
+    ValuesSerializer({"id": Field("id"), "start": Field("slot_master__start_time", iso)})
+    """
+
+    def __init__(self, fields):
+        self.lookups = []
+        self.mapper = self._compile(fields)
+
+    def _index(self, lookup):
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+        return self.lookups.index(lookup)
+
+    def _compile(self, fields, null_if=None):
+        getters = []
+        for key, spec in fields.items():
+            if isinstance(spec, Nested):
+                getters.append((key, self._compile(spec.fields, spec.null_if)))
+                continue
+
+            convert = spec.convert
+            if isinstance(spec.lookup, tuple):
+                indexes = [self._index(lookup) for lookup in spec.lookup]
+                getters.append((key, lambda row, ix=indexes, c=convert:
+                                None if row[ix[0]] is None else c(*[row[j] for j in ix])))
+                continue
+
+            i = self._index(spec.lookup)
+            if convert is None:
+                getters.append((key, lambda row, i=i: row[i]))
+            else:
+                getters.append((key, lambda row, i=i, c=convert: None if row[i] is None else c(row[i])))
+
+        null_index = self._index(null_if) if null_if else None
+
+        def mapper(row):
+            if null_index is not None and row[null_index] is None:
+                return None
+            return {key: get(row) for key, get in getters}
+        return mapper
+
+    def values(self, queryset):
+        """
+        The queryset as row tuples; can be paginated like any queryset.
+        """
+        return queryset.values_list(*self.lookups)
+
+    def to_representation(self, rows):
+        mapper = self.mapper
+        return [mapper(row) for row in rows]
+
+    def serialize(self, queryset):
+        return self.to_representation(self.values(queryset))
+
+
+class FastListMixin:
+    """
+    For ListAPIViews: render with `fast_serializer` (a ValuesSerializer)
+    instead of serializer_class, keeping filtering and pagination.
+    """
+    fast_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        if self.fast_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.fast_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.fast_serializer.to_representation(page))
+        return Response(self.fast_serializer.to_representation(rows))
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 from celery.schedules import crontab 
@@ -58,11 +59,37 @@ CELERY_BEAT_SCHEDULE = {
         "task": "scheduler.tasks.generate_rolling_slots",
         "schedule": crontab(hour=0, minute=0),
         # "schedule": crontab(minute="*/5"),
+    },
+    # Hourly so an interrupted run resumes soon; once done they skip until
+    # tomorrow. Bookings go first so their slots can be purged.
+    "archive-bookings": {
+        "task": "booking.tasks.archive_bookings",
+        "schedule": crontab(minute=3),
+    },
+    "purge-past-slots": {
+        "task": "scheduler.tasks.purge_past_slots",
+        "schedule": crontab(minute=5),
     },
         "expire-every-minute": {
         "task": "scheduler.tasks.watch_and_expire_slots",
         "schedule": crontab(minute="*"),
     },
+    # Safety net for slots freed by bulk updates; frees via decline, expiry
+    # and cancellation queue their own dates straight away
+    "promote-waitlist": {
+        "task": "booking.tasks.promote_waitlist",
+        "schedule": crontab(minute="*/5"),
+    },
+    # Checkout Idempotency-Keys past their replay window
+    "purge-checkout-keys": {
+        "task": "booking.tasks.purge_checkout_keys",
+        "schedule": crontab(minute=20),
+    },
+    # Image variants for uploads whose task could not be queued
+    "image-variants": {
+        "task": "services.tasks.generate_missing_image_variants",
+        "schedule": crontab(minute=15),
+    },
 }
 
 CELERY_BROKER_URL = "redis://127.0.0.1:6379/0"
@@ -72,12 +99,35 @@ CELERY_RESULT_BACKEND = "redis://127.0.0.1:6379/1"
 CELERY_ACCEPT_CONTENT = ["application/json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
+
+# Daily maintenance (scheduler.maintenance): a worker that stops renewing its
+# lease for this long is presumed dead and its job may be taken over
+MAINTENANCE_LEASE_SECONDS = 600
+# Past DailySlots archived and deleted per transaction by scheduler.purge
+SLOT_PURGE_BATCH_SIZE = 500
+# booking.archive: finished bookings move to the archive tables this many
+# days after their slot date, this many per transaction
+BOOKING_ARCHIVE_DAYS = 90
+BOOKING_ARCHIVE_BATCH_SIZE = 500
+
+# Months of holidays kept in the in-memory scheduler calendar
+SCHEDULER_CALENDAR_MONTHS = 6
+# How often a process checks whether its cached slot templates and calendar
+# are still current (scheduler.slot_templates, scheduler.business_calendar);
+# edits from other processes show up within this many seconds
+SCHEDULER_CACHE_CHECK_SECONDS = 5
+
+# Admin dashboard KPIs: served from cache for this long, then served stale
+# (while one worker recomputes) for up to the stale window
+ADMIN_DASHBOARD_CACHE_SECONDS = 30
+ADMIN_DASHBOARD_STALE_SECONDS = 300
 TIME_ZONE = 'Asia/Kolkata'
 USE_TZ = False
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'backend.middleware.ThresholdGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -97,7 +147,27 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
      'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # orjson when installed (pip install orjson), stdlib json otherwise
+    'DEFAULT_RENDERER_CLASSES': (
+        'backend.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'backend.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Token buckets (backend/throttling.py): burst size / refill period
+    'DEFAULT_THROTTLE_RATES': {
+        'auth': '10/min',      # per IP: login, register
+        'checkout': '10/min',  # per user
+        'cart': '60/min',      # per user
+    },
 }
+
+# "local": buckets per process; "cache": shared through CACHES (use a shared
+# cache such as Redis/Memcached when running several workers)
+RATE_LIMIT_STORE = 'local'
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -105,6 +175,13 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# backend.middleware.ThresholdGZipMiddleware: smaller responses go out uncompressed
+GZIP_MIN_BYTES = 1024
+
+# accounts.authentication: how long a user's active/disabled state and role
+# are trusted before they are checked again (IsAdmin/IsUser, TokenUserAuthentication)
+TOKEN_USER_REVOCATION_CACHE_SECONDS = 30
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -142,9 +219,25 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Take the write lock when the transaction starts; waiting writers
+            # then queue on the busy timeout instead of erroring on upgrade
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,  # seconds
+        },
     }
 }
 
+# Run on every new SQLite connection (backend/sqlite.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',         # readers don't block the writer and vice versa
+    'synchronous': 'NORMAL',       # fsync at checkpoints only; safe with WAL
+    'busy_timeout': 20000,         # ms, same as OPTIONS['timeout']
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+    'cache_size': -20000,          # KiB (~20 MB page cache)
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -165,6 +258,24 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# PBKDF2 cost is set per environment; stored hashes with a different cost are
+# upgraded on the next successful login. Hashing runs on a bounded pool
+# (accounts.hashing): WORKERS at once, QUEUE more waiting, the rest get a 503.
+
+PASSWORD_HASH_ITERATIONS = int(os.environ.get('PASSWORD_HASH_ITERATIONS', 1_000_000))
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 16))
+
+PASSWORD_HASHERS = [
+    'accounts.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -184,6 +295,9 @@ MEDIA_URL = '/media/'
 STATIC_ROOT = BASE_DIR / 'static'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Widths (px) of the resized JPEG/WebP copies made for service images
+SERVICE_IMAGE_WIDTHS = (320, 640, 1280)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -214,11 +328,13 @@ CORS_ALLOW_HEADERS = [
     "user-agent",
     "x-csrftoken",
     "x-requested-with",
+    "idempotency-key",
 ]
 CORS_EXPOSE_HEADERS = [
     "Content-Disposition",
     "Content-Length",
     "Content-Type",
+    "Idempotent-Replayed",
 ]
 
 
@@ -0,0 +1,28 @@
+# backend/sqlite.py
+"""
+SQLite performance profile, applied to every new connection.
+
+DATABASES["default"]["OPTIONS"] makes Django open write transactions with
+BEGIN IMMEDIATE (transaction_mode), so concurrent checkouts queue on the
+write lock up front instead of failing with "database is locked" when a
+read transaction tries to upgrade. The PRAGMAs in settings.SQLITE_PRAGMAS
+(WAL journal, synchronous=NORMAL, busy timeout, mmap...) are per connection
+and are run here, from the connection_created signal.
+
+Imported from backend/__init__.py so every process (web, celery, manage.py)
+gets the hook.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,226 @@
+# backend/throttling.py
+"""
+Token-bucket rate limiting for DRF views.
+
+Each scope ("auth", "checkout", "cart") gets a bucket per client holding up
+to N tokens that refills at N per period (REST_FRAMEWORK
+DEFAULT_THROTTLE_RATES, e.g. "10/min"). Bursts up to N pass, after that
+requests are refused with 429 and Retry-After.
+
+Buckets live in a process-local store or, with RATE_LIMIT_STORE = "cache",
+in Django's cache, so all workers share them when the cache is shared.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """
+    "10/min" -> (10, 60). None -> (None, None), i.e. unlimited.
+    """
+    if rate is None:
+        return None, None
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+def _take(state, capacity, refill_per_second, now):
+    """
+    Refill a (tokens, timestamp) bucket and try to take one token.
+    Returns (allowed, seconds until a token is available, new state).
+    """
+    tokens, stamp = state if state else (capacity, now)
+    tokens = min(capacity, tokens + (now - stamp) * refill_per_second)
+    if tokens >= 1:
+        return True, 0, (tokens - 1, now)
+    return False, (1 - tokens) / refill_per_second, (tokens, now)
+
+
+class LocalBucketStore:
+    """
+    Buckets in this process only (single worker / development).
+    """
+    MAX_BUCKETS = 50000
+
+    def __init__(self):
+        self._buckets = {}
+        self._counters = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_per_second):
+        now = time.monotonic()
+        with self._lock:
+            allowed, wait, state = _take(self._buckets.get(key), capacity, refill_per_second, now)
+            self._buckets[key] = state
+            if len(self._buckets) > self.MAX_BUCKETS:
+                # Drop buckets that have been idle long enough to be full again
+                idle = capacity / refill_per_second
+                self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < idle}
+        return allowed, wait
+
+    def incr(self, scope, outcome):
+        with self._lock:
+            self._counters[(scope, outcome)] += 1
+
+    def counters(self, scopes):
+        with self._lock:
+            return {scope: {o: self._counters[(scope, o)] for o in ("allowed", "throttled")} for scope in scopes}
+
+
+class CacheBucketStore:
+    """
+    Buckets in the Django cache, shared by every worker using that cache.
+    Read-modify-write is not atomic, so concurrent requests of one client
+    can slip a token or two past the limit; that is fine for abuse control.
+    """
+
+    def consume(self, key, capacity, refill_per_second):
+        now = time.time()
+        cache_key = f"throttle:{key}"
+        allowed, wait, state = _take(cache.get(cache_key), capacity, refill_per_second, now)
+        # Expires once the bucket would be full again anyway
+        cache.set(cache_key, state, math.ceil(capacity / refill_per_second) + 1)
+        return allowed, wait
+
+    def incr(self, scope, outcome):
+        key = f"throttle-metrics:{scope}:{outcome}"
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:  # evicted between add and incr
+                cache.add(key, 1, None)
+
+    def counters(self, scopes):
+        keys = {f"throttle-metrics:{s}:{o}": (s, o) for s in scopes for o in ("allowed", "throttled")}
+        found = cache.get_many(list(keys))
+        result = {scope: {"allowed": 0, "throttled": 0} for scope in scopes}
+        for key, (scope, outcome) in keys.items():
+            result[scope][outcome] = found.get(key, 0)
+        return result
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                kind = getattr(settings, "RATE_LIMIT_STORE", "local")
+                _store = CacheBucketStore() if kind == "cache" else LocalBucketStore()
+    return _store
+
+
+def throttle_metrics():
+    """
+    {scope: {"allowed": n, "throttled": n}} for every configured scope.
+    Counted per process with the local store, cluster-wide with the cache store.
+    """
+    return get_store().counters(sorted(api_settings.DEFAULT_THROTTLE_RATES))
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope = None
+    methods = None  # e.g. ("POST",) to leave reads alone
+
+    def __init__(self):
+        self.capacity, period = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(self.scope))
+        self.refill_per_second = self.capacity / period if self.capacity else None
+        self.wait_seconds = None
+
+    def get_key(self, request):
+        raise NotImplementedError(".get_key() must be overridden")
+
+    def allow_request(self, request, view):
+        if not self.capacity or (self.methods and request.method not in self.methods):
+            return True
+
+        store = get_store()
+        allowed, self.wait_seconds = store.consume(
+            f"{self.scope}:{self.get_key(request)}", self.capacity, self.refill_per_second
+        )
+        store.incr(self.scope, "allowed" if allowed else "throttled")
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+    def get_key(self, request):
+        return f"ip:{self.get_ident(request)}"
+
+
+_jwt = JWTAuthentication()
+
+
+def token_user_id(request):
+    """
+    user_id claim of a valid Bearer access token, without touching the
+    database (signature and expiry only); None otherwise.
+    """
+    header = _jwt.get_header(request)
+    raw = _jwt.get_raw_token(header) if header else None
+    if raw is None:
+        return None
+    try:
+        return _jwt.get_validated_token(raw).get(jwt_settings.USER_ID_CLAIM)
+    except (InvalidToken, TokenError):
+        return None
+
+
+class UserThrottle(TokenBucketThrottle):
+    """
+    Per user when the request carries a valid access token, per IP otherwise.
+    """
+
+    def get_key(self, request):
+        user_id = token_user_id(request)
+        if user_id is not None:
+            return f"user:{user_id}"
+        return f"ip:{self.get_ident(request)}"
+
+
+class AuthRateThrottle(IPThrottle):
+    scope = "auth"
+
+
+class CheckoutRateThrottle(UserThrottle):
+    scope = "checkout"
+    methods = ("POST",)
+
+
+class CartRateThrottle(UserThrottle):
+    scope = "cart"
+
+
+class ThrottleBeforeAuthMixin:
+    """
+    Run throttles before authentication/permissions (DRF runs them last), so
+    a refused request costs no user lookup, no lock and no password hash.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        self.check_throttles(request)
+        super().initial(request, *args, **kwargs)
+
+    def check_throttles(self, request):
+        if getattr(self, "_throttles_checked", False):
+            return
+        self._throttles_checked = True
+        super().check_throttles(request)
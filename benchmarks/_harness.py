@@ -0,0 +1,65 @@
+"""
+Shared setup for the scripts in this folder.
+
+Each benchmark runs against a throw-away test database (never db.sqlite3):
+
+    python -m benchmarks.auth_overhead
+"""
+import contextlib
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+
+@contextlib.contextmanager
+def test_database():
+    """
+    Create and migrate a fresh test database, drop it afterwards.
+    """
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(fn, repeat=200, warmup=10):
+    """
+    Call fn() `repeat` times; return (microseconds per call, queries per call).
+    """
+    for _ in range(warmup):
+        fn()
+
+    with CaptureQueriesContext(connection) as ctx:
+        fn()
+    queries = len(ctx.captured_queries)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - start
+    return elapsed / repeat * 1_000_000, queries
+
+
+def report(title, rows):
+    """
+    Print rows of (label, microseconds, queries) as a small table.
+    """
+    print(title)
+    print(f"  {'case':<40} {'us/call':>10} {'queries':>8}")
+    for label, micros, queries in rows:
+        print(f"  {label:<40} {micros:>10.1f} {queries:>8}")
+    print()
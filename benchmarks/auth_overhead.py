@@ -0,0 +1,54 @@
+"""
+Per-request overhead of authenticated calls to an IsAdmin endpoint.
+
+"role row":      IsAdmin loads request.user.role on every request (the
+                 original permission check).
+"account cache": IsAdmin reads the role through accounts.authentication
+                 current_role(), a per-process cache refreshed every
+                 TOKEN_USER_REVOCATION_CACHE_SECONDS.
+
+The JWT "role" claim is not used for authorization (it outlives a demotion).
+
+    python -m benchmarks.auth_overhead
+"""
+from unittest import mock
+
+from benchmarks._harness import measure, report, test_database
+
+from rest_framework.test import APIClient
+
+from accounts import permissions
+from accounts.models import Role, User
+from accounts.views import get_tokens_for_user
+
+
+def role_from_row(request):
+    return getattr(request.user.role, "name", "").lower()
+
+
+def run():
+    with test_database():
+        admin_role = Role.objects.create(name="admin")
+        admin = User.objects.create_user("bench-admin", "bench@example.com", "pw", role=admin_role)
+        admin.is_staff = True
+        admin.save()
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(admin)['access']}")
+
+        def call():
+            response = client.get("/api/services/admin/main/")
+            assert response.status_code == 200, response.status_code
+
+        with mock.patch.object(permissions, "_role_name", role_from_row):
+            row = measure(call)
+        cached = measure(call)
+
+        report("GET /api/services/admin/main/ (IsAuthenticated + IsAdmin)", [
+            ("role row loaded per request", *row),
+            ("role from account cache", *cached),
+        ])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,63 @@
+"""
+"Where does this cart fit?" for one date, in memory.
+
+"walk":      per start template, binary-search the prefix sums for the run
+             end, then check every slot of the run against the free set
+             (the previous _feasible_starts).
+"fit table": per start template, look the run length up in the registry's
+             fit table and AND a bitmap of the run with the free bitmap.
+
+A 15-minute grid from 08:00 to 22:00 (56 templates), half of them free.
+
+    python -m benchmarks.fit_table
+"""
+import random
+from datetime import time
+
+from benchmarks._harness import measure, report
+
+from scheduler.availability import _feasible_starts
+from scheduler.slot_templates import SlotTemplateRegistry
+
+
+class Template:
+    def __init__(self, pk, start, end):
+        self.id = pk
+        self.start_time = time(start // 60, start % 60)
+        self.end_time = time(end // 60, end % 60)
+
+
+def walk(registry, free_ids, duration):
+    for i, sm_id in enumerate(registry.ids):
+        if sm_id not in free_ids:
+            continue
+        j = registry._count(i, duration)
+        if j is None:
+            break
+        j = i + j - 1
+        if all(sm_id in free_ids for sm_id in registry.ids[i + 1:j + 1]):
+            yield i, j
+
+
+def run():
+    templates = [Template(n + 1, m, m + 15) for n, m in enumerate(range(8 * 60, 22 * 60, 15))]
+    registry = SlotTemplateRegistry(templates)
+
+    rng = random.Random(1)
+    days = [set(rng.sample(registry.ids, len(registry.ids) // 2)) for _ in range(60)]
+
+    rows = []
+    for duration in (30, 75, 120):
+        expected = [list(walk(registry, free, duration)) for free in days]
+        assert expected == [list(_feasible_starts(registry, free, duration)) for free in days]
+
+        rows.append((f"walk, {duration} min x 60 dates",
+                     *measure(lambda: [list(walk(registry, free, duration)) for free in days])))
+        rows.append((f"fit table, {duration} min x 60 dates",
+                     *measure(lambda: [list(_feasible_starts(registry, free, duration)) for free in days])))
+
+    report(f"Feasible starts over {len(registry)} templates", rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,67 @@
+"""
+JSONRenderer (stdlib) vs backend.renderers.FastJSONRenderer (orjson when
+installed) on the payloads of the largest responses: booking history,
+the slot list and the customer dashboard. Outputs must be byte-identical.
+
+    python -m benchmarks.json_rendering
+"""
+import io
+
+from benchmarks._harness import measure, report, test_database
+from benchmarks.serializers import BOOKINGS, populate
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from accounts.models import Role, User
+from accounts.views import get_tokens_for_user
+from backend import renderers
+from backend.renderers import FastJSONParser, FastJSONRenderer
+from booking.serializers import BookingSerializer
+from booking.models import Booking
+from scheduler.models import DailySlot
+from scheduler.serializers import DailySlotSerializer
+
+
+def run():
+    with test_database():
+        day = populate()
+        admin = User.objects.create_user("bench-admin", "admin@example.com", None,
+                                         role=Role.objects.create(name="admin"))
+        admin.is_staff = True
+        admin.save()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer " + get_tokens_for_user(admin)["access"])
+
+        payloads = {
+            f"booking history ({BOOKINGS})": BookingSerializer(
+                Booking.objects.select_related("user", "start_slot__slot_master")
+                .prefetch_related("services__service"), many=True).data,
+            "slot list": DailySlotSerializer(
+                DailySlot.objects.filter(slot_date=day).select_related("slot_master"), many=True).data,
+            "customer dashboard": client.get("/api/auth/admin/customers/dashboard/?page_size=100").data,
+            # raw Decimal/datetime values, as views that skip serializers return them
+            "raw values": list(Booking.objects.values("id", "grand_total", "created_at", "start_slot__slot_date")),
+        }
+
+        stdlib, fast = JSONRenderer(), FastJSONRenderer()
+        rows = []
+        for label, data in payloads.items():
+            expected = stdlib.render(data)
+            assert fast.render(data) == expected, label
+            rows.append((f"render {label}: stdlib", *measure(lambda: stdlib.render(data), repeat=50)))
+            rows.append((f"render {label}: fast", *measure(lambda: fast.render(data), repeat=50)))
+
+        body = stdlib.render(payloads[f"booking history ({BOOKINGS})"])
+        rows.append(("parse booking history: stdlib",
+                     *measure(lambda: JSONParser().parse(io.BytesIO(body)), repeat=50)))
+        rows.append(("parse booking history: fast",
+                     *measure(lambda: FastJSONParser().parse(io.BytesIO(body)), repeat=50)))
+
+        backend = "orjson " + renderers.orjson.__version__ if renderers.orjson else "stdlib fallback"
+        report(f"JSON rendering/parsing ({backend})", rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,79 @@
+"""
+Catalog request latency while logins hash passwords in the background.
+
+"inline": every login thread runs PBKDF2 itself (old behaviour), so N
+          concurrent logins means N hashes competing with the request.
+"pool":   logins go through accounts.hashing; at most PASSWORD_HASH_WORKERS
+          hashes run at once and the overflow is turned away (503).
+
+    python -m benchmarks.password_hashing
+"""
+import threading
+
+from benchmarks._harness import measure, report, test_database
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework.test import APIClient
+
+from accounts import hashing
+from services.models import Gender
+
+LOGIN_THREADS = 8
+
+
+def under_load(verify, encoded, fn):
+    stop = threading.Event()
+    counts = {"hashed": 0, "busy": 0}
+
+    def login_loop():
+        while not stop.is_set():
+            try:
+                verify("correct horse", encoded)
+                counts["hashed"] += 1
+            except hashing.HashingBusy:
+                counts["busy"] += 1
+                stop.wait(0.05)  # client backs off on 503
+
+    threads = [threading.Thread(target=login_loop, daemon=True) for _ in range(LOGIN_THREADS)]
+    for t in threads:
+        t.start()
+    try:
+        result = measure(fn, repeat=50, warmup=5)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+    return result, counts
+
+
+def run():
+    with test_database():
+        Gender.objects.create(name="Men")
+        encoded = hashers.make_password("correct horse")
+        client = APIClient()
+
+        def fn():
+            response = client.get("/api/services/user/genders/")
+            assert response.status_code == 200, response.status_code
+
+        idle = measure(fn, repeat=50, warmup=5)
+        inline, inline_counts = under_load(hashers.check_password, encoded, fn)
+        pooled, pooled_counts = under_load(hashing.verify_password, encoded, fn)
+
+        report(
+            f"GET /api/services/user/genders/ with {LOGIN_THREADS} login threads "
+            f"(PBKDF2 {settings.PASSWORD_HASH_ITERATIONS} iterations, "
+            f"{settings.PASSWORD_HASH_WORKERS} hash workers)",
+            [
+                ("idle", *idle),
+                ("inline hashing", *inline),
+                ("bounded hashing pool", *pooled),
+            ],
+        )
+        print(f"  hashes completed: inline={inline_counts['hashed']} pool={pooled_counts['hashed']}"
+              f" (pool rejected {pooled_counts['busy']})")
+
+
+if __name__ == "__main__":
+    run()
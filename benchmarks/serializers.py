@@ -0,0 +1,93 @@
+"""
+Per-row serialization cost: DRF serializers vs the values_list fast path
+(backend/serialization.py), on the rows of DailySlotListAPIView and
+BookingHistoryView. Both paths must produce identical JSON.
+
+    python -m benchmarks.serializers
+"""
+import json
+from datetime import date, time, timedelta
+
+from benchmarks._harness import measure, report, test_database
+
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import Role, User
+from booking.models import Booking, BookingService
+from booking.serializers import BookingSerializer, booking_rows
+from scheduler import availability
+from scheduler.models import DailySlot, SlotMaster
+from scheduler.serializers import DAILY_SLOT_ROWS, DailySlotSerializer
+from services.models import Child_services, Gender, MainServices
+
+SLOTS = 48
+BOOKINGS = 300
+
+
+def render(data):
+    return json.loads(JSONRenderer().render(data))
+
+
+@availability.deferred_summary_updates()
+def populate():
+    day = date.today() + timedelta(days=1)
+    slots = []
+    for i in range(SLOTS):
+        start = time(i // 2, 30 * (i % 2))
+        end = time((i + 1) // 2 % 24, 30 * ((i + 1) % 2))
+        master = SlotMaster.objects.create(start_time=start, end_time=end)
+        # SlotMaster's post_save may already have generated the slot
+        slots.append(DailySlot.objects.get_or_create(slot_master=master, slot_date=day)[0])
+
+    gender = Gender.objects.create(name="male")
+    main = MainServices.objects.create(gender=gender, main_services_name="Hair")
+    services = [
+        Child_services.objects.create(gender=gender, main_services=main,
+                                      child_service_name=f"Service {i}", price=100 + i)
+        for i in range(5)
+    ]
+    user = User.objects.create_user("bench", "bench@example.com", None, role=Role.objects.create(name="user"))
+
+    for i in range(BOOKINGS):
+        booking = Booking.objects.create(user=user, start_slot=slots[i % SLOTS])
+        BookingService.objects.bulk_create([
+            BookingService(booking=booking, service=services[i % 5]),
+            BookingService(booking=booking, service=services[(i + 1) % 5]),
+        ])
+        booking.calculate_totals()
+    return day
+
+
+def run():
+    with test_database():
+        day = populate()
+
+        slot_qs = DailySlot.objects.filter(slot_date=day).select_related("slot_master").order_by("slot_master__start_time")
+        booking_qs = (
+            Booking.objects
+            .select_related("user", "start_slot__slot_master")
+            .prefetch_related("services__service")
+            .order_by("-created_at")
+        )
+
+        assert render(DailySlotSerializer(slot_qs, many=True).data) == render(DAILY_SLOT_ROWS.serialize(slot_qs))
+        assert render(BookingSerializer(booking_qs, many=True).data) == render(booking_rows(booking_qs))
+
+        def per_row(fn, rows):
+            micros, queries = measure(fn, repeat=30, warmup=3)
+            return micros / rows, queries
+
+        report("Serialization, microseconds per row (incl. queries)", [
+            (f"slots: DailySlotSerializer ({SLOTS} rows)",
+             *per_row(lambda: DailySlotSerializer(slot_qs.all(), many=True).data, SLOTS)),
+            ("slots: DAILY_SLOT_ROWS",
+             *per_row(lambda: DAILY_SLOT_ROWS.serialize(slot_qs.all()), SLOTS)),
+            (f"history: BookingSerializer ({BOOKINGS} rows)",
+             *per_row(lambda: BookingSerializer(booking_qs.all(), many=True).data, BOOKINGS)),
+            ("history: booking_rows",
+             *per_row(lambda: booking_rows(booking_qs.all()), BOOKINGS)),
+        ])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,135 @@
+"""
+Concurrent checkouts against a file-backed SQLite database.
+
+"defaults": Django's stock SQLite setup (deferred transactions, rollback
+            journal, 5 s timeout, no PRAGMAs).
+"tuned":    the profile from settings (BEGIN IMMEDIATE, WAL,
+            synchronous=NORMAL, busy timeout, mmap; backend/sqlite.py).
+
+Every thread is a different customer checking out different slots, so any
+failure is lock contention, not a real booking conflict.
+
+    python -m benchmarks.sqlite_checkout_stress
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import time as dtime
+from unittest import mock
+
+from benchmarks._harness import test_database
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Role, User
+from booking.views import CheckoutView
+from scheduler.models import DailySlot, SlotMaster
+from services.models import Child_services, Gender, MainServices
+
+THREADS = 16
+CHECKOUTS_PER_THREAD = 6
+
+
+def populate():
+    for n in range(48):
+        start = 8 * 60 + n * 15
+        SlotMaster.objects.create(
+            start_time=dtime(start // 60, start % 60),
+            end_time=dtime((start + 15) // 60, (start + 15) % 60),
+        )  # signal creates today..+2 slots
+
+    gender = Gender.objects.create(name="male")
+    main = MainServices.objects.create(gender=gender, main_services_name="Hair")
+    service = Child_services.objects.create(
+        gender=gender, main_services=main, child_service_name="Trim", price=100, duration=15
+    )
+    role, _ = Role.objects.get_or_create(name="user")
+    users = User.objects.bulk_create([
+        User(username=f"stress{i}", email=f"stress{i}@x.com", password="!", role=role)
+        for i in range(THREADS)
+    ])
+    slot_ids = list(
+        DailySlot.objects.filter(
+            slot_date__gt=timezone.localdate(), status="available"
+        ).order_by("id").values_list("id", flat=True)
+    )
+    return service, users, slot_ids
+
+
+def stress(service, users, slot_ids):
+    results = {"ok": 0, "locked": 0, "other": 0}
+    lock = threading.Lock()
+    start = threading.Barrier(THREADS)
+
+    def customer(index, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        mine = slot_ids[index::THREADS][:CHECKOUTS_PER_THREAD]
+        start.wait()
+        try:
+            for slot_id in mine:
+                try:
+                    response = client.post(
+                        "/api/booking/checkout/",
+                        {"start_slot_id": slot_id, "services": [{"service_id": service.id}]},
+                        format="json",
+                    )
+                    outcome = "ok" if response.status_code == 201 else (
+                        "locked" if "locked" in str(response.data) else "other"
+                    )
+                except Exception as e:
+                    outcome = "locked" if "locked" in str(e) else "other"
+                with lock:
+                    results[outcome] += 1
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=customer, args=(i, u)) for i, u in enumerate(users)]
+    began = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - began
+
+
+def run_profile(label, options, pragmas):
+    db_file = os.path.join(tempfile.mkdtemp(), "stress.sqlite3")
+    db = connections.settings["default"]
+    saved = db["OPTIONS"], db["TEST"].get("NAME")
+    db["OPTIONS"], db["TEST"]["NAME"] = options, db_file
+    connection.settings_dict["OPTIONS"] = options
+    connection.settings_dict["TEST"]["NAME"] = db_file
+
+    try:
+        # Rate limiting is not what's measured here
+        with mock.patch.object(CheckoutView, "throttle_classes", []), \
+                override_settings(SQLITE_PRAGMAS=pragmas), test_database():
+            service, users, slot_ids = populate()
+            results, elapsed = stress(service, users, slot_ids)
+    finally:
+        db["OPTIONS"], db["TEST"]["NAME"] = saved
+        connection.settings_dict["OPTIONS"] = saved[0]
+        connection.settings_dict["TEST"]["NAME"] = saved[1]
+
+    total = THREADS * CHECKOUTS_PER_THREAD
+    print(f"  {label:<10} {results['ok']:>4}/{total} booked  {results['locked']:>4} locked"
+          f"  {results['other']:>3} other  {elapsed:6.2f}s")
+
+
+def run():
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)  # one line per failed checkout otherwise
+    print(f"{THREADS} customers x {CHECKOUTS_PER_THREAD} checkouts, file-backed SQLite")
+    run_profile("defaults", {}, {})
+    run_profile("tuned", settings.DATABASES["default"]["OPTIONS"], settings.SQLITE_PRAGMAS)
+
+
+if __name__ == "__main__":
+    run()
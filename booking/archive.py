@@ -0,0 +1,128 @@
+# booking/archive.py
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.signals import deferred_profile_refresh
+from backend.conditional import collapsed_bumps
+from scheduler import maintenance
+from .models import ArchivedBooking, ArchivedBookingService, Booking, BookingService
+
+
+ARCHIVE_STATUSES = ("completed", "declined", "cancelled")
+ARCHIVE_AFTER_DAYS = getattr(settings, "BOOKING_ARCHIVE_DAYS", 90)
+ARCHIVE_BATCH_SIZE = getattr(settings, "BOOKING_ARCHIVE_BATCH_SIZE", 500)
+
+
+def archive_old_bookings(days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move finished bookings whose slot date is more than `days` days ago into
+    ArchivedBooking / ArchivedBookingService, `batch_size` bookings per short
+    transaction.
+
+    Slot date/times, totals and service names are snapshotted, so the slot
+    rows can be purged afterwards (scheduler.purge skips slots that still
+    have a booking). Runs once per day under a MaintenanceRun lease with a
+    checkpoint, like the slot purge.
+    """
+    run = maintenance.acquire("archive_bookings")
+    if run is None:
+        return "SKIPPED: already done or running today"
+
+    progress = run.checkpoint or {"last_id": 0, "archived": 0}
+    cutoff = timezone.localdate() - timedelta(days=days)
+
+    try:
+        while True:
+            rows = list(
+                Booking.objects
+                .filter(
+                    id__gt=progress["last_id"],
+                    status__in=ARCHIVE_STATUSES,
+                    start_slot__slot_date__lt=cutoff,
+                )
+                .order_by("id")
+                .values_list(
+                    "id", "user_id", "status", "created_at",
+                    "start_slot__slot_date",
+                    "start_slot__slot_master__start_time",
+                    "start_slot__slot_master__end_time",
+                    "total_price", "gst_percent", "gst_amount", "grand_total",
+                )[:batch_size]
+            )
+            if not rows:
+                break
+
+            archived = _archive_batch(rows)
+
+            progress = {
+                "last_id": rows[-1][0],
+                "archived": progress["archived"] + archived,
+            }
+            if not maintenance.save_checkpoint(run, progress):
+                return "STOPPED: lease taken over by another worker"
+    except Exception as e:
+        maintenance.finish(run, "failed", repr(e))
+        raise
+
+    result = f"Archived {progress['archived']} bookings older than {cutoff}"
+    maintenance.finish(run, "done", result)
+    return result
+
+
+def _archive_batch(rows):
+    ids = [row[0] for row in rows]
+
+    services = defaultdict(list)
+    lines = (
+        BookingService.objects
+        .filter(booking_id__in=ids)
+        .order_by("id")
+        .values_list("booking_id", "service_id", "service__child_service_name", "service__price")
+    )
+    for booking_id, service_id, name, price in lines:
+        services[booking_id].append((service_id, name, price))
+
+    with transaction.atomic():
+        # Same id in the archive = batch re-run after a lost checkpoint
+        done = set(ArchivedBooking.objects.filter(original_id__in=ids).values_list("original_id", flat=True))
+
+        archives = ArchivedBooking.objects.bulk_create([
+            ArchivedBooking(
+                original_id=pk,
+                user_id=user_id,
+                status=status,
+                created_at=created_at,
+                slot_date=slot_date,
+                start_time=start_time,
+                end_time=end_time,
+                total_price=total_price,
+                gst_percent=gst_percent,
+                gst_amount=gst_amount,
+                grand_total=grand_total,
+            )
+            for (pk, user_id, status, created_at, slot_date, start_time, end_time,
+                 total_price, gst_percent, gst_amount, grand_total) in rows
+            if pk not in done
+        ])
+
+        ArchivedBookingService.objects.bulk_create([
+            ArchivedBookingService(
+                booking=archive,
+                service_id=service_id,
+                service_name=name,
+                price=price,
+            )
+            for archive in archives
+            for service_id, name, price in services[archive.original_id]
+        ])
+
+        # Per-booking delete signals: one profile recount per customer and
+        # one ETag bump for the whole batch
+        with deferred_profile_refresh(), collapsed_bumps():
+            Booking.objects.filter(id__in=ids).delete()
+
+    return len(archives)
@@ -0,0 +1,130 @@
+# booking/dashboard.py
+import logging
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from accounts.models import User
+from . import history
+from .helpers import mark_completed_bookings
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "booking:admin-dashboard"
+REFRESH_LOCK_KEY = "booking:admin-dashboard:refreshing"
+
+
+def _fresh_seconds():
+    return getattr(settings, "ADMIN_DASHBOARD_CACHE_SECONDS", 30)
+
+
+def _stale_seconds():
+    return getattr(settings, "ADMIN_DASHBOARD_STALE_SECONDS", 300)
+
+
+def compute_dashboard_kpis():
+    """
+    Every KPI of the admin home page from one conditional-aggregation query
+    per booking table (live and archived), a distinct-customer count over
+    both and one count over User.
+    Response groups mirror the individual stats endpoints.
+    """
+    now = timezone.now()
+    last_24_hours = now - timedelta(hours=24)
+    start_month = now.replace(day=1)
+
+    completed = Q(status="completed")
+    completed_24h = completed & Q(created_at__gte=last_24_hours)
+
+    totals = history.aggregate(
+        total=Count("id"),
+        completed=Count("id", filter=completed),
+        pending=Count("id", filter=Q(status="pending")),
+        sales=Count("id", filter=completed_24h),
+        revenue_24h=Sum("grand_total", filter=completed_24h),
+        total_revenue=Sum("grand_total", filter=completed),
+    )
+    totals["customers"] = history.distinct_customers(completed)
+
+    new_customers = User.objects.filter(role__name="user", date_joined__gte=start_month).count()
+
+    revenue_24h = totals["revenue_24h"] or Decimal("0.00")
+    total_revenue = totals["total_revenue"] or Decimal("0.00")
+
+    return {
+        "orders": {
+            "total_orders": totals["total"],
+            "completed_orders": totals["completed"],
+            "pending_orders": totals["pending"],
+        },
+        "appointments": {
+            "total": totals["total"],
+            "completed": totals["completed"],
+            "pending": totals["pending"],
+        },
+        "sales": {
+            "sales": totals["sales"],
+            "revenue": float(revenue_24h),
+            "expenses": float(revenue_24h * Decimal("0.20")),
+            "time_range": "last_24_hours",
+        },
+        "summary": {
+            "total_revenue": float(total_revenue),
+            "appointments": totals["completed"],
+            "new_customers": totals["customers"],
+        },
+        "new_customers": {
+            "new_customers": new_customers,
+        },
+    }
+
+
+def refresh_dashboard_kpis():
+    """
+    Recompute and cache the KPIs. The entry outlives the fresh window by the
+    stale window so readers can be served while a refresh runs.
+    """
+    mark_completed_bookings()
+    entry = {"data": compute_dashboard_kpis(), "computed_at": time.time()}
+    cache.set(CACHE_KEY, entry, _fresh_seconds() + _stale_seconds())
+    return entry
+
+
+def _refresh_in_background():
+    # A thread, not a celery task: the default cache is per process, so only
+    # this process can refresh the entry its requests read
+    try:
+        refresh_dashboard_kpis()
+    except Exception:
+        logger.exception("Admin dashboard refresh failed; serving the stale copy")
+    finally:
+        cache.delete(REFRESH_LOCK_KEY)
+        connections.close_all()  # this thread's connections, never reused
+
+
+def get_dashboard_kpis():
+    """
+    Cached KPIs with stale-while-revalidate.
+    Returns (data, age_seconds, is_stale).
+    """
+    entry = cache.get(CACHE_KEY)
+    if entry is None:
+        entry = refresh_dashboard_kpis()
+
+    age = time.time() - entry["computed_at"]
+    is_stale = age >= _fresh_seconds()
+
+    # Only one worker revalidates; everyone else keeps serving the stale copy
+    if is_stale and cache.add(REFRESH_LOCK_KEY, 1, _fresh_seconds()):
+        # Not a daemon: shutdown waits for the refresh instead of killing it mid-query
+        threading.Thread(target=_refresh_in_background, name="dashboard-refresh").start()
+
+    return entry["data"], int(age), is_stale
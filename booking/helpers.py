@@ -1,29 +1,45 @@
-from datetime import datetime, date
+from datetime import datetime
 
-def compute_required_slot_master_ids(start_slot_master, slot_masters_ordered, required_minutes):
+from django.utils import timezone
+
+from backend.conditional import bump
+from scheduler.slot_templates import get_registry
+from .models import Booking
+
+def compute_required_slot_master_ids(start_slot_master, required_minutes):
     """
-    Given a starting SlotMaster and a list of ordered active SlotMasters,
-    return list of consecutive slot_master ids whose total minutes >= required_minutes.
+    Given a starting SlotMaster (or its id), return list of consecutive
+    active slot_master ids whose total minutes >= required_minutes.
+    Returns an empty list if not enough consecutive slots exist.
+
+    The count comes from the process-wide registry's fit table (durations
+    snapped to the slot grid), so this is a dictionary lookup instead of a
+    walk over SlotMaster rows.
     """
-    ids = []
-    total = 0
-    found_start = False
+    start_id = getattr(start_slot_master, "id", start_slot_master)
+    return get_registry().required_ids(start_id, required_minutes)
 
-    for sm in slot_masters_ordered:
-        if not found_start:
-            if sm.id == start_slot_master.id:
-                found_start = True
-            else:
-                continue
 
-        start_dt = datetime.combine(date.today(), sm.start_time)
-        end_dt = datetime.combine(date.today(), sm.end_time)
+def mark_completed_bookings():
+    """
+    Mark bookings as completed if slot end time is passed.
+    """
+    now = timezone.now()
 
-        minutes = int((end_dt - start_dt).total_seconds() / 60)
-        ids.append(sm.id)
-        total += minutes
+    # Only check confirmed bookings
+    bookings = (
+        Booking.objects
+        .filter(status="confirmed")
+        .values_list("id", "start_slot__slot_date", "start_slot__slot_master__end_time")
+    )
 
-        if total >= required_minutes:
-            break
+    finished = [
+        booking_id
+        for booking_id, slot_date, end_time in bookings
+        # Combine slot date + end time
+        if now > timezone.make_aware(datetime.combine(slot_date, end_time))
+    ]
 
-    return ids if total >= required_minutes else None
+    if finished:
+        Booking.objects.filter(id__in=finished).update(status="completed")
+        bump("bookings")
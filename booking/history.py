@@ -0,0 +1,74 @@
+# booking/history.py
+"""
+Analytics over live and archived bookings.
+
+ArchivedBooking keeps Booking's names for status, user, created_at and the
+totals, so the same filters and aggregates run unchanged on both tables;
+the helpers here run them on each and combine the results.
+"""
+from collections import defaultdict
+
+from django.db.models import Count, Q
+
+from .models import ArchivedBooking, ArchivedBookingService, Booking, BookingService
+
+
+SOURCES = (Booking, ArchivedBooking)
+
+
+def _querysets(q):
+    return [model.objects.filter(q or Q()) for model in SOURCES]
+
+
+def aggregate(q=None, **aggregates):
+    """
+    Count/Sum aggregates over both tables, added up. A value stays None
+    (like Django's Sum over no rows) only when both sides are None.
+    """
+    totals = dict.fromkeys(aggregates)
+    for qs in _querysets(q):
+        for key, value in qs.aggregate(**aggregates).items():
+            if value is not None:
+                totals[key] = value if totals[key] is None else totals[key] + value
+    return totals
+
+
+def distinct_customers(q=None):
+    """Number of distinct users with a matching booking in either table."""
+    live, archived = _querysets(q)
+    return live.values("user").union(archived.values("user")).count()
+
+
+def grouped(q, name, expression, **aggregates):
+    """
+    Rows of {name: group value, <aggregate>: total} over both tables,
+    ordered by the group value, e.g.
+        grouped(Q(status="completed"), "month", TruncMonth("created_at"), visits=Count("id"))
+    """
+    merged = defaultdict(lambda: dict.fromkeys(aggregates, 0))
+    for qs in _querysets(q):
+        rows = qs.annotate(**{name: expression}).values(name).annotate(**aggregates).order_by(name)
+        for row in rows:
+            totals = merged[row[name]]
+            for key in aggregates:
+                totals[key] += row[key] or 0
+    return [{name: key, **merged[key]} for key in sorted(merged)]
+
+
+def service_counts(status="completed"):
+    """{service name: number of booked services} over both tables."""
+    counts = defaultdict(int)
+    live = (
+        BookingService.objects.filter(booking__status=status)
+        .values("service__child_service_name").annotate(count=Count("id"))
+        .values_list("service__child_service_name", "count")
+    )
+    archived = (
+        ArchivedBookingService.objects.filter(booking__status=status)
+        .values("service_name").annotate(count=Count("id"))
+        .values_list("service_name", "count")
+    )
+    for rows in (live, archived):
+        for service_name, count in rows:
+            counts[service_name] += count
+    return counts
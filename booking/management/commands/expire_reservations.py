@@ -4,6 +4,8 @@ from django.utils import timezone
 from datetime import timedelta
 from booking.models import Booking, RESERVATION_MINUTES
 from scheduler.models import DailySlot
+from booking.helpers import compute_required_slot_master_ids
+from scheduler import availability
 
 class Command(BaseCommand):
     help = "Expire pending bookings older than RESERVATION_MINUTES and free their slots"
@@ -12,15 +14,19 @@ class Command(BaseCommand):
         cutoff = timezone.now() - timedelta(minutes=RESERVATION_MINUTES)
         expired = Booking.objects.filter(status='pending', created_at__lt=cutoff)
         count = expired.count()
-        for b in expired:
-            # free related slots (booking.start_slot and possibly more if compute_required_slot_master_ids used)
-            start = b.start_slot
-            # free only the start slot to be safe, or free related slots if you track them elsewhere
-            if start:
-                start.status = 'available'
-                start.booked_by = None
-                start.booked_service = None
-                start.save()
-            b.status = 'cancelled'
-            b.save(update_fields=['status'])
+        # Slot saves queue their dates; summaries are rebuilt once at the end
+        with availability.deferred_summary_updates():
+            for b in expired:
+                # free every slot of the booking's run, not just the start slot,
+                # so the waitlist sees the whole run as available again
+                start = b.start_slot
+                total_minutes = sum(int(bs.service.duration) for bs in b.services.all())
+                needed = compute_required_slot_master_ids(start.slot_master_id, total_minutes) or [start.slot_master_id]
+                for s in DailySlot.objects.filter(slot_master_id__in=needed, slot_date=start.slot_date, booked_by=b.user_id):
+                    s.status = 'available'
+                    s.booked_by = None
+                    s.booked_service = None
+                    s.save()
+                b.status = 'cancelled'
+                b.save(update_fields=['status'])
         self.stdout.write(self.style.SUCCESS(f"Expired {count} pending bookings"))
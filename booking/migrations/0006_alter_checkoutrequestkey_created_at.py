@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 20:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0005_archivedbooking_archivedbookingservice_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='checkoutrequestkey',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -10,6 +10,10 @@ from decimal import Decimal
 # Slot reservation duration before admin approval
 RESERVATION_MINUTES = 15   # slot auto free after 15min if admin not approved
 
+# Checkout Idempotency-Key handling
+IDEMPOTENCY_KEY_HOURS = 24      # how long a finished checkout can be replayed
+IDEMPOTENCY_CLAIM_SECONDS = 120  # an unfinished claim older than this is taken over
+
 
 # ------------------------------
 # 1) CART ITEM
@@ -142,3 +146,145 @@ class AdminNotification(models.Model):
     def __str__(self):
         return f"Notification #{self.id} - {self.message[:25]}"
 
+
+# ------------------------------
+# 5) CHECKOUT IDEMPOTENCY KEYS
+# ------------------------------
+class CheckoutRequestKey(models.Model):
+    """
+    One row per (user, Idempotency-Key) sent to CheckoutView. Created when the
+    request starts, linked to the booking inside the checkout transaction and
+    filled with the response so client retries are replayed, not re-run.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="checkout_keys"
+    )
+    key = models.CharField(max_length=255)
+    booking = models.ForeignKey(
+        Booking,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+"
+    )
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # expiry sweep (booking.tasks)
+
+    class Meta:
+        unique_together = ('user', 'key')
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key} → {self.booking_id or 'in progress'}"
+
+
+# ------------------------------
+# 6) WAITLIST FOR FULL DATES
+# ------------------------------
+class WaitlistEntry(models.Model):
+    """
+    A user waiting for `duration_minutes` of consecutive free slots on
+    `slot_date`, optionally inside a time-of-day window. When slots free up
+    booking.waitlist places a pending Booking (the hold) for the first
+    entries that fit, highest priority then oldest first.
+    """
+    STATUS_CHOICES = (
+        ("waiting", "Waiting"),
+        ("promoted", "Promoted"),     # hold placed, see `booking`
+        ("cancelled", "Cancelled"),   # withdrawn by the user
+        ("expired", "Expired"),       # date passed without a fit
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries"
+    )
+    slot_date = models.DateField()
+    window_start = models.TimeField(null=True, blank=True)
+    window_end = models.TimeField(null=True, blank=True)
+
+    # Cart at registration time; the cart itself may change afterwards
+    service_ids = models.JSONField(default=list)
+    duration_minutes = models.PositiveIntegerField()
+
+    priority = models.IntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="waiting")
+    booking = models.ForeignKey(
+        Booking,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    promoted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "slot_date"]),
+        ]
+
+    def __str__(self):
+        return f"Waitlist #{self.id} - {self.user_id} on {self.slot_date} ({self.status})"
+
+
+# ------------------------------
+# 7) ARCHIVED BOOKINGS
+# ------------------------------
+class ArchivedBooking(models.Model):
+    """
+    A finished booking moved out of Booking by booking.archive, with its
+    slot date/times snapshotted so the DailySlot can be purged too.
+    Field names match Booking where they overlap, so analytics can run the
+    same filters/aggregates on both (booking.history).
+    """
+    original_id = models.BigIntegerField(unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_bookings'
+    )
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+
+    slot_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    total_price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    gst_percent = models.DecimalField(max_digits=5, decimal_places=2, default=18)
+    gst_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    grand_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Archived booking #{self.original_id} - {self.user_id} ({self.status})"
+
+
+class ArchivedBookingService(models.Model):
+    booking = models.ForeignKey(
+        ArchivedBooking,
+        on_delete=models.CASCADE,
+        related_name='services'
+    )
+    service = models.ForeignKey(
+        Child_services,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL
+    )
+    # Snapshot: the catalogue entry may change or disappear later
+    service_name = models.CharField(max_length=100)
+    price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.booking.original_id} → {self.service_name}"
@@ -0,0 +1,156 @@
+# booking/rescheduling.py
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from backend.conditional import bump
+from scheduler import availability
+from scheduler.models import DailySlot
+from scheduler.slot_templates import get_registry
+from .models import AdminNotification, Booking
+from .waitlist import queue_promotion
+
+
+CHANGEABLE_STATUSES = ("pending", "confirmed")
+
+
+class BookingChangeError(Exception):
+    """The booking can't be changed (wrong status, already started...)."""
+
+
+class SlotConflict(BookingChangeError):
+    """Some of the requested slots are not free (taken meanwhile)."""
+
+
+def _run_slots(booking, slot_date, start_master_id):
+    """
+    Slot ids, in start_time order, of the run a booking of this length
+    occupies when it starts at `start_master_id` on `slot_date`.
+    """
+    minutes = sum(int(d) for d in booking.services.values_list("service__duration", flat=True))
+    master_ids = get_registry().required_ids(start_master_id, minutes)
+    if not master_ids:
+        raise SlotConflict("Not enough consecutive slots")
+
+    slot_ids = list(
+        DailySlot.objects
+        .filter(slot_date=slot_date, slot_master_id__in=master_ids)
+        .order_by("slot_master__start_time")
+        .values_list("id", flat=True)
+    )
+    if len(slot_ids) != len(master_ids):
+        raise SlotConflict("Not enough consecutive slots")
+    return slot_ids
+
+
+def _lock_changeable(booking_id, user_id):
+    booking = (
+        Booking.objects.select_for_update()
+        .select_related("start_slot__slot_master")
+        .filter(id=booking_id, user_id=user_id)
+        .first()
+    )
+    if booking is None:
+        raise Booking.DoesNotExist
+    if booking.status not in CHANGEABLE_STATUSES:
+        raise BookingChangeError(f"Booking is {booking.status}")
+
+    slot = booking.start_slot
+    starts_at = timezone.make_aware(datetime.combine(slot.slot_date, slot.slot_master.start_time))
+    if starts_at <= timezone.now():
+        raise BookingChangeError("Booking has already started")
+    return booking
+
+
+def _release(slot_ids, user_id):
+    return DailySlot.objects.filter(id__in=slot_ids, status="booked", booked_by_id=user_id).update(
+        status="available",
+        booked_by=None,
+        booked_service=None,
+    )
+
+
+def cancel_booking(booking_id, user_id):
+    """
+    Cancel the user's own pending/confirmed booking and free its slots in
+    one transaction. The freed date is offered to the waitlist on commit
+    (booking.signals).
+    """
+    with transaction.atomic():
+        booking = _lock_changeable(booking_id, user_id)
+        slot = booking.start_slot
+        slot_ids = _run_slots(booking, slot.slot_date, slot.slot_master_id)
+
+        _release(slot_ids, user_id)
+        booking.status = "cancelled"
+        booking.save(update_fields=["status"])
+
+        # .update() skips the DailySlot signals
+        availability.rebuild_summaries([slot.slot_date])
+    return booking
+
+
+def reschedule_booking(booking_id, user_id, new_start_slot_id):
+    """
+    Move the user's booking to the run starting at `new_start_slot_id`.
+
+    The new run is claimed and the old one released in the same transaction
+    with two set-based updates; slots in both runs (a shift within the day)
+    are kept as they are. The claim only touches slots that are still
+    available, so if fewer rows change than were asked for, another customer
+    got there first: everything rolls back and SlotConflict is raised.
+
+    Returns (booking, new slot ids in start_time order).
+    """
+    with transaction.atomic():
+        booking = _lock_changeable(booking_id, user_id)
+        old = booking.start_slot
+
+        new_start = (
+            DailySlot.objects.select_related("slot_master")
+            .filter(id=new_start_slot_id)
+            .first()
+        )
+        if new_start is None:
+            raise BookingChangeError("Slot not found")
+        starts_at = timezone.make_aware(datetime.combine(new_start.slot_date, new_start.slot_master.start_time))
+        if starts_at <= timezone.now():
+            raise BookingChangeError("Slot is in the past")
+
+        old_ids = _run_slots(booking, old.slot_date, old.slot_master_id)
+        new_ids = _run_slots(booking, new_start.slot_date, new_start.slot_master_id)
+
+        to_claim = [slot_id for slot_id in new_ids if slot_id not in old_ids]
+        to_release = [slot_id for slot_id in old_ids if slot_id not in new_ids]
+
+        first_service = booking.services.values_list("service_id", flat=True).first()
+        claimed = DailySlot.objects.filter(id__in=to_claim, status="available").update(
+            status="booked",
+            booked_by_id=user_id,
+            booked_service_id=first_service,
+        )
+        if claimed != len(to_claim):
+            raise SlotConflict("Some slots already booked")
+
+        _release(to_release, user_id)
+
+        booking.start_slot = new_start
+        booking.save(update_fields=["start_slot"])
+
+        AdminNotification.objects.create(
+            booking=booking,
+            message=f" Booking #{booking.id} rescheduled by {booking.user.username} "
+                    f"from {old.slot_date} {old.slot_master.start_time} "
+                    f"to {new_start.slot_date} {new_start.slot_master.start_time}"
+        )
+
+        # A shift within one day can leave that day's summary unchanged
+        # while different slots are free, so bump regardless
+        availability.rebuild_summaries({old.slot_date, new_start.slot_date})
+        bump("slots")
+        if to_release:
+            transaction.on_commit(lambda: queue_promotion([old.slot_date]))
+
+    return booking, new_ids
+
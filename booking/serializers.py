@@ -1,8 +1,10 @@
 # booking/serializers.py
 from rest_framework import serializers
-from .models import CartItem, Booking, BookingService
+from .models import CartItem, Booking, BookingService, WaitlistEntry
 from services.models import Child_services
 from scheduler.models import DailySlot
+from collections import defaultdict
+from backend.serialization import Field, Nested, ValuesSerializer, datetime_iso, decimal_str, iso
 
 # ---------------------
 # Cart Serializers (unchanged)
@@ -73,6 +75,45 @@ class BookingSerializer(serializers.ModelSerializer):
 
 
 
+# Same JSON as BookingSerializer, built from values_list rows (BookingHistoryView)
+BOOKING_ROWS = ValuesSerializer({
+    "id": Field("id"),
+    "username": Field("user__username"),
+    "services": Field("id"),  # placeholder, filled by booking_rows()
+    "slot_info": Nested({
+        "date": Field("start_slot__slot_date", iso),
+        "start": Field("start_slot__slot_master__start_time", iso),
+        "end": Field("start_slot__slot_master__end_time", iso),
+    }),
+    "total_price": Field("total_price", decimal_str),
+    "gst_amount": Field("gst_amount", decimal_str),
+    "grand_total": Field("grand_total", decimal_str),
+    "status": Field("status"),
+    "created_at": Field("created_at", datetime_iso),
+})
+
+
+def booking_rows(queryset):
+    """
+    BOOKING_ROWS plus each booking's services, from two queries in total.
+    """
+    bookings = BOOKING_ROWS.serialize(queryset)
+
+    services = defaultdict(list)
+    lines = (
+        BookingService.objects
+        .filter(booking__in=queryset.values("id"))
+        .order_by("id")
+        .values_list("id", "booking_id", "service_id", "service__child_service_name")
+    )
+    for pk, booking_id, service_id, service_name in lines:
+        services[booking_id].append({"id": pk, "service": service_id, "service_name": service_name})
+
+    for booking in bookings:
+        booking["services"] = services.get(booking["id"], [])
+    return bookings
+
+
 # ---------------------
 # Create Booking Serializer (used by single endpoint)
 # ---------------------
@@ -97,3 +138,44 @@ class CreateBookingSerializer(serializers.Serializer):
                 raise serializers.ValidationError(f"Service {service_id} not found.")
         return data
 
+
+
+# ---------------------
+# Waitlist
+# ---------------------
+class WaitlistEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WaitlistEntry
+        fields = [
+            "id",
+            "slot_date",
+            "window_start",
+            "window_end",
+            "service_ids",
+            "duration_minutes",
+            "status",
+            "booking",
+            "created_at",
+            "promoted_at",
+        ]
+
+
+class CreateWaitlistSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    window_start = serializers.TimeField(required=False, allow_null=True)
+    window_end = serializers.TimeField(required=False, allow_null=True)
+    # Defaults to the user's cart
+    services = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate_services(self, value):
+        found = set(Child_services.objects.filter(id__in=value).values_list("id", flat=True))
+        missing = [service_id for service_id in value if service_id not in found]
+        if missing:
+            raise serializers.ValidationError(f"Service {missing[0]} not found.")
+        return value
+
+    def validate(self, data):
+        start, end = data.get("window_start"), data.get("window_end")
+        if start and end and start >= end:
+            raise serializers.ValidationError("window_start must be before window_end.")
+        return data
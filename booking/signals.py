@@ -1,9 +1,12 @@
 # booking/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from django.db import transaction
 from django.core.mail import send_mail
 from django.conf import settings
 from .models import Booking
+from .waitlist import queue_promotion
+from backend.conditional import bump
 
 @receiver(post_save, sender=Booking)
 def notify_on_booking_change(sender, instance, created, **kwargs):
@@ -39,3 +42,23 @@ def notify_on_booking_change(sender, instance, created, **kwargs):
                 )
             except Exception:
                 pass
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def bookings_changed(sender, **kwargs):
+    bump("bookings")
+
+
+@receiver(post_save, sender=Booking)
+def offer_freed_slots_to_waitlist(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Declined/cancelled (incl. expired) booking → its slots are free again,
+    match that date's waitlist once the transaction commits.
+    """
+    if created or instance.status not in ("declined", "cancelled"):
+        return
+    if update_fields is not None and "status" not in update_fields:
+        return
+    slot_date = instance.start_slot.slot_date
+    transaction.on_commit(lambda: queue_promotion([slot_date]))
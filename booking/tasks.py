@@ -0,0 +1,34 @@
+from datetime import date, timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from . import archive, waitlist
+from .models import CheckoutRequestKey, IDEMPOTENCY_KEY_HOURS
+
+
+@shared_task
+def promote_waitlist(dates=None):
+    """
+    Match waitlist entries against free slots. `dates` (ISO strings) are the
+    dates where slots were just freed; the periodic sweep passes none.
+    """
+    if dates is not None:
+        dates = [date.fromisoformat(d) for d in dates]
+    return len(waitlist.promote_waitlist(dates))
+
+
+@shared_task
+def archive_bookings():
+    return archive.archive_old_bookings()
+
+
+@shared_task
+def purge_checkout_keys():
+    """
+    Drop Idempotency-Keys older than IDEMPOTENCY_KEY_HOURS; they can no
+    longer be replayed, and otherwise only a reuse of the same key removes them.
+    """
+    cutoff = timezone.now() - timedelta(hours=IDEMPOTENCY_KEY_HOURS)
+    deleted, _ = CheckoutRequestKey.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
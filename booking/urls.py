@@ -3,11 +3,17 @@ from .views import (
     CartAddView,
     CartView,
     CheckoutView,
+    NextAvailableView,
+    WaitlistView,
+    WaitlistCancelView,
+    BookingCancelView,
+    BookingRescheduleView,
     AdminAcceptView,
     AdminDeclineView,
     BookingHistoryView,
     AdminNotificationListView,
     AdminNotificationMarkReadView,
+    AdminDashboardView,
     AdminbookingStatsView,
     AdminSalesStatsView,
     AdminCustomerTrendView,
@@ -30,7 +36,12 @@ urlpatterns = [
     # USER BOOKING ROUTES
     # ------------------------------
     path('checkout/', CheckoutView.as_view(), name='booking-checkout'),
+    path('next-available/', NextAvailableView.as_view(), name='booking-next-available'),
     path('history/', BookingHistoryView.as_view(), name='booking-history'),
+    path('<int:booking_id>/cancel/', BookingCancelView.as_view(), name='booking-cancel'),
+    path('<int:booking_id>/reschedule/', BookingRescheduleView.as_view(), name='booking-reschedule'),
+    path('waitlist/', WaitlistView.as_view(), name='booking-waitlist'),
+    path('waitlist/<int:entry_id>/cancel/', WaitlistCancelView.as_view(), name='booking-waitlist-cancel'),
 
 
     # ------------------------------
@@ -40,6 +51,7 @@ urlpatterns = [
     path("admin/notifications/<int:notif_id>/read/", AdminNotificationMarkReadView.as_view()),
     path('admin/accept/', AdminAcceptView.as_view(), name='booking-admin-accept'),
     path('admin/decline/', AdminDeclineView.as_view(), name='booking-admin-decline'),
+    path("admin/dashboard/", AdminDashboardView.as_view(), name="admin-dashboard"),
     path("admin/orders/stats/", AdminbookingStatsView.as_view()),
      path("admin/sales/stats/", AdminSalesStatsView.as_view()),
      path("admin/customers/trend/", AdminCustomerTrendView.as_view()),
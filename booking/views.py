@@ -2,24 +2,40 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
-from django.db import transaction
+from django.db import transaction, IntegrityError
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Count
+from django.db.models import Count, Q
 from datetime import datetime,timedelta
 from django.db.models import Sum
 from decimal import Decimal
 from .models import CartItem, Booking, BookingService, RESERVATION_MINUTES,AdminNotification
-from .serializers import BookingSerializer, CreateBookingSerializer
+from .models import CheckoutRequestKey, IDEMPOTENCY_KEY_HOURS, IDEMPOTENCY_CLAIM_SECONDS
+from .serializers import BookingSerializer, CreateBookingSerializer, booking_rows
+from .serializers import WaitlistEntrySerializer, CreateWaitlistSerializer
+from .models import WaitlistEntry
+from .waitlist import queue_promotion
+from .rescheduling import BookingChangeError, SlotConflict, cancel_booking, reschedule_booking
 from scheduler.models import DailySlot, SlotMaster
 from services.models import Child_services
 from django.db.models.functions import TruncMonth
-from booking.helpers import compute_required_slot_master_ids  # you indicated this exists
+from booking.helpers import compute_required_slot_master_ids, mark_completed_bookings
+from booking.dashboard import get_dashboard_kpis
+from booking import history
+from accounts.models import User
+from backend.conditional import conditional_get
+from backend.throttling import CartRateThrottle, CheckoutRateThrottle, ThrottleBeforeAuthMixin
+from accounts.authentication import TokenUserAuthentication
+from scheduler import availability
+from scheduler.availability import find_next_available
+from scheduler.business_calendar import get_calendar
 
 
 
-class CartAddView(APIView):
+class CartAddView(ThrottleBeforeAuthMixin, APIView):
+    authentication_classes = [TokenUserAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [CartRateThrottle]
 
     def post(self, request, service_id):
         # Validate service exists
@@ -30,7 +46,7 @@ class CartAddView(APIView):
 
         # Add or increase quantity
         item, created = CartItem.objects.get_or_create(
-            user=request.user,
+            user_id=request.user.id,
             service=service
         )
 
@@ -47,11 +63,13 @@ class CartAddView(APIView):
 
 
 
-class CartView(APIView):
+class CartView(ThrottleBeforeAuthMixin, APIView):
+    authentication_classes = [TokenUserAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [CartRateThrottle]
 
     def get(self, request):
-        items = CartItem.objects.filter(user=request.user)
+        items = CartItem.objects.filter(user_id=request.user.id).select_related("service")
         ser = []  # reuse serializer as needed
         subtotal = sum([float(i.service.price) * i.quantity for i in items])
         gst = round(subtotal * 0.18, 2)
@@ -67,41 +85,124 @@ class CartView(APIView):
 
 
 
-# --- Helper: compute required slot_master ids starting from a given slot_master
-def compute_required_slot_master_ids(start_slot_master, ordered_slot_masters_qs, total_minutes):
+class NextAvailableView(APIView):
     """
-    Returns a list of slot_master IDs (consecutive) starting from start_slot_master
-    that together cover >= total_minutes.
-    ordered_slot_masters_qs must be queryset/list ordered by start_time.
-    If not enough consecutive slots exist, returns empty list.
+    GET → earliest start slots, across dates, where the cart fits.
+
+    Query params:
+      duration  total minutes (defaults to the logged-in user's cart)
+      from, to  optional time-of-day window, HH:MM
+      limit     number of results, 1-50 (default 5; larger values are capped)
     """
-    # Convert queryset to list to get index
-    slot_masters = list(ordered_slot_masters_qs)
-    try:
-        start_index = next(i for i, sm in enumerate(slot_masters) if sm.id == start_slot_master.id)
-    except StopIteration:
-        return []
-
-    accumulated = 0
-    needed_ids = []
-    for sm in slot_masters[start_index:]:
-        # calculate duration in minutes between sm.start_time and sm.end_time
-        # start_time/end_time are time objects, convert to datetime on same day
-        dt_start = datetime.combine(datetime.today(), sm.start_time)
-        dt_end = datetime.combine(datetime.today(), sm.end_time)
-        duration = int((dt_end - dt_start).total_seconds() // 60)
-        if duration <= 0:
-            # fallback: assume 30 minutes if bad data
-            duration = 30
-
-        accumulated += duration
-        needed_ids.append(sm.id)
-
-        if accumulated >= total_minutes:
-            return needed_ids
-
-    # not enough consecutive slots
-    return []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        duration = request.query_params.get("duration")
+        if duration:
+            try:
+                duration = int(duration)
+            except ValueError:
+                return Response({"detail": "duration must be a number of minutes"}, status=400)
+        elif request.user.is_authenticated:
+            duration = sum(
+                CartItem.objects.filter(user=request.user).values_list("service__duration", flat=True)
+            )
+            if not duration:
+                return Response({"detail": "Cart is empty"}, status=400)
+        else:
+            return Response({"detail": "duration parameter is required"}, status=400)
+
+        try:
+            window_start = self._parse_time(request.query_params.get("from"))
+            window_end = self._parse_time(request.query_params.get("to"))
+            limit = min(int(request.query_params.get("limit", 5)), 50)
+        except ValueError:
+            return Response({"detail": "from/to must be HH:MM and limit a number"}, status=400)
+        if limit < 1:
+            return Response({"detail": "limit must be at least 1"}, status=400)
+
+        now = timezone.localtime()
+        results = find_next_available(
+            duration,
+            limit=limit,
+            from_date=now.date(),
+            window_start=window_start,
+            window_end=window_end,
+            now=now,
+        )
+        return Response({"duration": duration, "results": results}, status=200)
+
+    @staticmethod
+    def _parse_time(value):
+        if not value:
+            return None
+        return datetime.strptime(value, "%H:%M").time()
+
+
+class WaitlistView(APIView):
+    """
+    GET  → the user's waitlist entries, newest first.
+    POST → wait for a full date: {date, window_start?, window_end?, services?}.
+           Without `services` the current cart is used. When slots free up
+           a pending booking is placed automatically (see booking.waitlist).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        entries = WaitlistEntry.objects.filter(user=request.user).order_by("-created_at")
+        return Response(WaitlistEntrySerializer(entries, many=True).data, status=200)
+
+    def post(self, request):
+        serializer = CreateWaitlistSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        slot_date = data["date"]
+        if slot_date < timezone.localdate():
+            return Response({"detail": "Date is in the past"}, status=400)
+        if get_calendar().is_closed(slot_date):
+            return Response({"detail": "Salon is closed on this date"}, status=400)
+
+        if "services" in data:
+            service_ids = data["services"]
+            durations = Child_services.objects.filter(id__in=service_ids).values_list("id", "duration")
+        else:
+            durations = CartItem.objects.filter(user=request.user).values_list("service_id", "service__duration")
+            service_ids = [service_id for service_id, _ in durations]
+
+        duration = sum(int(minutes) for _, minutes in durations)
+        if not duration:
+            return Response({"detail": "Cart is empty"}, status=400)
+
+        if WaitlistEntry.objects.filter(user=request.user, slot_date=slot_date, status="waiting").exists():
+            return Response({"detail": "Already on the waitlist for this date"}, status=400)
+
+        entry = WaitlistEntry.objects.create(
+            user=request.user,
+            slot_date=slot_date,
+            window_start=data.get("window_start"),
+            window_end=data.get("window_end"),
+            service_ids=service_ids,
+            duration_minutes=duration,
+        )
+        # Something may already fit (e.g. freed while the user was deciding)
+        transaction.on_commit(lambda: queue_promotion([slot_date]))
+
+        return Response(WaitlistEntrySerializer(entry).data, status=201)
+
+
+class WaitlistCancelView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, entry_id):
+        cancelled = WaitlistEntry.objects.filter(
+            id=entry_id, user=request.user, status="waiting"
+        ).update(status="cancelled")
+
+        if not cancelled:
+            return Response({"detail": "No waiting entry with this id"}, status=404)
+        return Response({"detail": "Removed from waitlist"}, status=200)
+
 
 def create_admin_notification(booking):
     """
@@ -114,9 +215,74 @@ def create_admin_notification(booking):
         message=message
     )
 
+def checkout_response_data(booking, user, services):
+    slot = booking.start_slot
+    return {
+        "booking_id": booking.id,
+        "username": user.username,
+        "email": user.email,
+        "date": str(slot.slot_date),
+        "time": f"{slot.slot_master.start_time} - {slot.slot_master.end_time}",
+        "services": services,
+        "total_price": float(booking.grand_total),
+        "status": booking.status,
+    }
+
+
+def claim_checkout_key(user, key):
+    """
+    Claim an Idempotency-Key for a checkout.
+    Returns (claim, None) when the request should run, or (None, response)
+    when it must not: a replay of the finished checkout, or 409 while the
+    first attempt is still running.
+    """
+    now = timezone.now()
+    CheckoutRequestKey.objects.filter(
+        user=user, key=key, created_at__lt=now - timedelta(hours=IDEMPOTENCY_KEY_HOURS)
+    ).delete()
+
+    try:
+        with transaction.atomic():
+            return CheckoutRequestKey.objects.create(user=user, key=key), None
+    except IntegrityError:
+        pass
+
+    existing = CheckoutRequestKey.objects.select_related(
+        "booking__start_slot__slot_master"
+    ).filter(user=user, key=key).first()
+
+    if existing and existing.status_code is not None:
+        response = Response(existing.response_body, status=existing.status_code)
+        response["Idempotent-Replayed"] = "true"
+        return None, response
+
+    if existing and existing.booking_id:
+        # Booking committed but the response was never stored (worker died)
+        services = list(existing.booking.services.values_list("service__child_service_name", flat=True))
+        data = checkout_response_data(existing.booking, user, services)
+        CheckoutRequestKey.objects.filter(pk=existing.pk).update(status_code=201, response_body=data)
+        response = Response(data, status=201)
+        response["Idempotent-Replayed"] = "true"
+        return None, response
+
+    # Abandoned claim without a booking → take it over
+    if existing and existing.created_at < now - timedelta(seconds=IDEMPOTENCY_CLAIM_SECONDS):
+        taken = CheckoutRequestKey.objects.filter(
+            pk=existing.pk, booking__isnull=True, created_at=existing.created_at
+        ).update(created_at=now)
+        if taken:
+            return existing, None
+
+    return None, Response(
+        {"detail": "A checkout with this Idempotency-Key is already in progress"},
+        status=409
+    )
+
+
 # --- Fixed CheckoutView
-class CheckoutView(APIView):
+class CheckoutView(ThrottleBeforeAuthMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [CheckoutRateThrottle]
 
     def get(self, request):
         booking = Booking.objects.filter(user=request.user).order_by('-created_at').first()
@@ -128,35 +294,62 @@ class CheckoutView(APIView):
         return Response(serializer.data, status=200)
 
     def post(self, request):
+        key = request.headers.get("Idempotency-Key")
+        if not key:
+            return self._checkout(request)
+
+        claim, response = claim_checkout_key(request.user, key[:255])
+        if response is not None:
+            return response
+
+        try:
+            response = self._checkout(request, claim)
+        except Exception:
+            claim.delete()
+            raise
+
+        if response.status_code == 201:
+            CheckoutRequestKey.objects.filter(pk=claim.pk).update(
+                status_code=response.status_code,
+                response_body=response.data,
+            )
+        else:
+            # Failed attempts are not remembered, the client may retry
+            claim.delete()
+        return response
+
+    def _checkout(self, request, claim=None):
         serializer = CreateBookingSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
 
         start_slot_id = serializer.validated_data["start_slot_id"]
         services_list = serializer.validated_data["services"]
 
-        # Calculate total required minutes
+        # Calculate total required minutes (one query; the registry's fit
+        # table turns it into a template count below)
         cart_items = CartItem.objects.filter(user=request.user)
-        total_minutes = 0
 
         if cart_items.exists():
-            for ci in cart_items:
-                total_minutes += int(ci.service.duration)
+            durations = list(cart_items.values_list("service__duration", flat=True))
         else:
-            for s in services_list:
-                service = Child_services.objects.get(id=s["service_id"])
-                total_minutes += int(service.duration)
+            by_id = dict(
+                Child_services.objects
+                .filter(id__in=[s["service_id"] for s in services_list])
+                .values_list("id", "duration")
+            )
+            durations = [by_id[s["service_id"]] for s in services_list]
+        total_minutes = sum(int(d) for d in durations)
 
         try:
-            with transaction.atomic():
+            # Slot saves queue their date; the summary is rebuilt once, in the transaction
+            with transaction.atomic(), availability.deferred_summary_updates():
                 start_slot = DailySlot.objects.select_for_update().get(id=start_slot_id)
 
                 if start_slot.status != "available":
                     return Response({"detail": "Start slot not available"}, status=400)
 
-                slot_masters = SlotMaster.objects.filter(is_active=True).order_by("start_time")
                 needed_master_ids = compute_required_slot_master_ids(
-                    start_slot.slot_master,
-                    slot_masters,
+                    start_slot.slot_master_id,
                     total_minutes,
                 )
 
@@ -174,12 +367,11 @@ class CheckoutView(APIView):
                         return Response({"detail": "Some slots already booked"}, status=400)
 
                 # Reserve slots
+                booked_service = Child_services.objects.get(id=services_list[0]["service_id"])
                 for s in required_slots:
                     s.status = "booked"
                     s.booked_by = request.user
-                    s.booked_service = Child_services.objects.get(
-                        id=services_list[0]["service_id"]
-                    )
+                    s.booked_service = booked_service
                     s.save()
 
                 # Create Booking
@@ -204,25 +396,74 @@ class CheckoutView(APIView):
 
                 booking.calculate_totals()
 
+                if claim:
+                    CheckoutRequestKey.objects.filter(pk=claim.pk).update(booking=booking)
+
         except Exception as e:
             return Response({"detail": "Booking error", "error": str(e)}, status=500)
 
         #SEND NOTIFICATION TO ADMIN HERE
         create_admin_notification(booking)
 
+        response = checkout_response_data(booking, request.user, saved_services)
+        return Response(response, status=201)
+    
+
+class BookingCancelView(ThrottleBeforeAuthMixin, APIView):
+    """
+    POST → cancel the user's own pending/confirmed booking; its slots are
+    freed (and offered to the waitlist) in the same transaction.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [CheckoutRateThrottle]
 
-        response = {
+    def post(self, request, booking_id):
+        try:
+            booking = cancel_booking(booking_id, request.user.id)
+        except Booking.DoesNotExist:
+            return Response({"detail": "Booking not found"}, status=404)
+        except BookingChangeError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        return Response({"booking_id": booking.id, "status": booking.status}, status=200)
+
+
+class BookingRescheduleView(ThrottleBeforeAuthMixin, APIView):
+    """
+    POST {start_slot_id} → move the user's booking to a new start slot.
+    The new run is claimed and the old one released atomically; 409 if
+    any slot of the new run is taken. Returns the new slots.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [CheckoutRateThrottle]
+
+    def post(self, request, booking_id):
+        try:
+            start_slot_id = int(request.data.get("start_slot_id"))
+        except (TypeError, ValueError):
+            return Response({"detail": "start_slot_id is required"}, status=400)
+
+        try:
+            booking, slot_ids = reschedule_booking(booking_id, request.user.id, start_slot_id)
+        except Booking.DoesNotExist:
+            return Response({"detail": "Booking not found"}, status=404)
+        except SlotConflict as e:
+            return Response({"detail": str(e)}, status=409)
+        except BookingChangeError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        slots = (
+            DailySlot.objects.filter(id__in=slot_ids)
+            .order_by("slot_master__start_time")
+            .values_list("id", "slot_master__start_time", "slot_master__end_time")
+        )
+        return Response({
             "booking_id": booking.id,
-            "username": request.user.username,
-            "email": request.user.email,
-            "date": str(start_slot.slot_date),
-            "time": f"{start_slot.slot_master.start_time} - {start_slot.slot_master.end_time}",
-            "services": saved_services,
-            "total_price": float(booking.grand_total),
             "status": booking.status,
-        }
-        return Response(response, status=201)
-    
+            "date": str(booking.start_slot.slot_date),
+            "slots": [{"id": pk, "start": start, "end": end} for pk, start, end in slots],
+        }, status=200)
+
 
 class AdminNotificationListView(APIView):
     permission_classes = [permissions.IsAdminUser]
@@ -268,8 +509,7 @@ class AdminAcceptView(APIView):
         # find all slots required and set them to final booked state (they are already set to 'booked' above)
         # We assume the same compute_required_slot_master_ids helper to calculate the full set from booking.start_slot
         total_minutes = sum([bs.service.duration for bs in booking.services.all()])
-        slot_masters = SlotMaster.objects.filter(is_active=True).order_by("start_time")
-        needed = compute_required_slot_master_ids(booking.start_slot.slot_master, slot_masters, total_minutes)
+        needed = compute_required_slot_master_ids(booking.start_slot.slot_master_id, total_minutes)
 
         DailySlot.objects.filter(
             slot_master_id__in=needed,
@@ -302,19 +542,19 @@ class AdminDeclineView(APIView):
             return Response({"detail": "Booking already declined/cancelled"}, status=400)
 
         total_minutes = sum([bs.service.duration for bs in booking.services.all()])
-        slot_masters = SlotMaster.objects.filter(is_active=True).order_by("start_time")
-        needed = compute_required_slot_master_ids(booking.start_slot.slot_master, slot_masters, total_minutes)
+        needed = compute_required_slot_master_ids(booking.start_slot.slot_master_id, total_minutes)
 
         # Free slots: set to available and remove booked_by/booked_service
         slots_qs = DailySlot.objects.filter(
             slot_master_id__in=needed,
             slot_date=booking.start_slot.slot_date
         )
-        for s in slots_qs:
-            s.status = 'available'
-            s.booked_by = None
-            s.booked_service = None
-            s.save()
+        with availability.deferred_summary_updates():  # one summary rebuild, not one per slot
+            for s in slots_qs:
+                s.status = 'available'
+                s.booked_by = None
+                s.booked_service = None
+                s.save()
 
         booking.status = 'declined'
         booking.save(update_fields=['status'])
@@ -329,61 +569,50 @@ class AdminDeclineView(APIView):
 class BookingHistoryView(APIView):
     permission_classes = [permissions.IsAdminUser]  # 🔐 ADMIN ONLY
 
+    @conditional_get("bookings", "users")
     def get(self, request):
-        bookings = (
-            Booking.objects
-            .select_related("user", "start_slot__slot_master")
-            .prefetch_related("services__service")
-            .order_by("-created_at")
-        )
+        bookings = Booking.objects.order_by("-created_at")
 
-        serializer = BookingSerializer(bookings, many=True)
-        return Response(serializer.data, status=200)
+        # Same shape as BookingSerializer, without per-row serializer overhead
+        return Response(booking_rows(bookings), status=200)
 
 
-def mark_completed_bookings():
+class AdminDashboardView(APIView):
     """
-    Mark bookings as completed if slot end time is passed.
+    All admin home-page KPIs in one response (orders, appointments, sales,
+    summary, new customers), computed in one pass and briefly cached.
     """
-    now = timezone.now()
-
-    # Only check confirmed bookings
-    bookings = (
-        Booking.objects
-        .filter(status="confirmed")
-        .select_related("start_slot__slot_master")
-    )
-
-    for booking in bookings:
-        slot = booking.start_slot
-        slot_master = slot.slot_master
-
-        # Combine slot date + end time
-        slot_end_datetime = timezone.make_aware(
-            datetime.combine(slot.slot_date, slot_master.end_time)
-        )
+    permission_classes = [permissions.IsAdminUser]
 
-        if now > slot_end_datetime:
-            booking.status = "completed"
-            booking.save(update_fields=["status"])
+    def get(self, request):
+        data, age, is_stale = get_dashboard_kpis()
+        response = Response(data, status=200)
+        response["Age"] = str(age)
+        if is_stale:
+            response["Warning"] = '110 - "Response is Stale"'
+        return response
 
 
 class AdminbookingStatsView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
+    @conditional_get("bookings", "users", period=60)
     def get(self, request):
         # 🔥 IMPORTANT: auto-update completed bookings first
         mark_completed_bookings()
 
-        total_orders = Booking.objects.count()
-        completed_orders = Booking.objects.filter(status="completed").count()
-        pending_orders = Booking.objects.filter(status="pending").count()
+        # Live + archived bookings
+        totals = history.aggregate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(status="completed")),
+            pending=Count("id", filter=Q(status="pending")),
+        )
 
         return Response(
             {
-                "total_orders": total_orders,
-                "completed_orders": completed_orders,
-                "pending_orders": pending_orders,
+                "total_orders": totals["total"],
+                "completed_orders": totals["completed"],
+                "pending_orders": totals["pending"],
             },
             status=200
         )
@@ -391,22 +620,23 @@ class AdminbookingStatsView(APIView):
 class AdminSalesStatsView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
+    @conditional_get("bookings", "users", period=60)
     def get(self, request):
         now = timezone.now()
         last_24_hours = now - timedelta(hours=24)
 
-        completed_bookings = Booking.objects.filter(
-            status="completed",
-            created_at__gte=last_24_hours
+        # Live + archived bookings
+        totals = history.aggregate(
+            Q(status="completed", created_at__gte=last_24_hours),
+            sales=Count("id"),
+            revenue=Sum("grand_total"),
         )
 
         # 1️⃣ SALES (count)
-        sales_count = completed_bookings.count()
+        sales_count = totals["sales"]
 
         # 2️⃣ REVENUE (Decimal)
-        revenue = completed_bookings.aggregate(
-            total=Sum("grand_total")
-        )["total"] or Decimal("0.00")
+        revenue = totals["revenue"] or Decimal("0.00")
 
         # 3️⃣ EXPENSES (20% of revenue)
         expenses = revenue * Decimal("0.20")
@@ -424,6 +654,7 @@ class AdminSalesStatsView(APIView):
 class AdminCustomerTrendView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
+    @conditional_get("bookings", "users", period=60)
     def get(self, request):
         """
         Returns customer visit trend for last 6 months
@@ -432,17 +663,11 @@ class AdminCustomerTrendView(APIView):
         today = timezone.now().date()
         six_months_ago = today - timedelta(days=180)
 
-        # Group completed bookings by month
-        qs = (
-            Booking.objects
-            .filter(
-                status="completed",
-                created_at__date__gte=six_months_ago
-            )
-            .annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(visits=Count("id"))
-            .order_by("month")
+        # Group completed bookings (live + archived) by month
+        qs = history.grouped(
+            Q(status="completed", created_at__date__gte=six_months_ago),
+            "month", TruncMonth("created_at"),
+            visits=Count("id"),
         )
 
         # Prepare response
@@ -467,24 +692,19 @@ class AdminCustomerTrendView(APIView):
 class AdminAnalyticsSummaryView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
+    @conditional_get("bookings", "users", period=60)
     def get(self, request):
-        completed_bookings = Booking.objects.filter(status="completed")
+        completed = Q(status="completed")  # live + archived bookings
+        totals = history.aggregate(completed, revenue=Sum("grand_total"), appointments=Count("id"))
 
         # Total Revenue
-        total_revenue = completed_bookings.aggregate(
-            total=Sum("grand_total")
-        )["total"] or Decimal("0.00")
+        total_revenue = totals["revenue"] or Decimal("0.00")
 
         # Appointments (completed bookings)
-        appointments = completed_bookings.count()
+        appointments = totals["appointments"]
 
         # New Customers (distinct users who completed at least one booking)
-        new_customers = (
-            completed_bookings
-            .values("user")
-            .distinct()
-            .count()
-        )
+        new_customers = history.distinct_customers(completed)
 
         return Response({
             "total_revenue": float(total_revenue),
@@ -498,14 +718,12 @@ class AdminAnalyticsSummaryView(APIView):
 class AdminMonthlyRevenueView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
+    @conditional_get("bookings", "users", period=60)
     def get(self, request):
-        qs = (
-            Booking.objects
-            .filter(status="completed")
-            .annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(total=Sum("grand_total"))
-            .order_by("month")
+        qs = history.grouped(
+            Q(status="completed"),
+            "month", TruncMonth("created_at"),
+            total=Sum("grand_total"),
         )
 
         labels = []
@@ -526,20 +744,17 @@ class AdminMonthlyRevenueView(APIView):
 class AdminServiceDistributionView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
+    @conditional_get("bookings", "users", period=60)
     def get(self, request):
-        qs = (
-            BookingService.objects
-            .filter(booking__status="completed")
-            .values("service__child_service_name")
-            .annotate(count=Count("id"))
-        )
+        # Live + archived bookings
+        counts = history.service_counts("completed")
 
         labels = []
         data = []
 
-        for row in qs:
-            labels.append(row["service__child_service_name"])
-            data.append(row["count"])
+        for service_name, count in counts.items():
+            labels.append(service_name)
+            data.append(count)
 
         return Response({
             "labels": labels,
@@ -552,15 +767,19 @@ class AdminServiceDistributionView(APIView):
 class AdminAppointmentsStatsView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
+    @conditional_get("bookings", "users", period=60)
     def get(self, request):
-        total = Booking.objects.count()
-        completed = Booking.objects.filter(status="completed").count()
-        pending = Booking.objects.filter(status="pending").count()
+        # Live + archived bookings
+        totals = history.aggregate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(status="completed")),
+            pending=Count("id", filter=Q(status="pending")),
+        )
 
         return Response({
-            "total": total,
-            "completed": completed,
-            "pending": pending
+            "total": totals["total"],
+            "completed": totals["completed"],
+            "pending": totals["pending"]
         })
 
 
@@ -570,6 +789,7 @@ class AdminAppointmentsStatsView(APIView):
 class AdminNewCustomersView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
+    @conditional_get("bookings", "users", period=60)
     def get(self, request):
         now = timezone.now()
         start_month = now.replace(day=1)
@@ -0,0 +1,161 @@
+# booking/waitlist.py
+from collections import defaultdict
+from datetime import date
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+from django.utils import timezone
+
+from scheduler import availability
+from scheduler.availability import _feasible_starts
+from scheduler.models import DailySlot
+from scheduler.slot_templates import get_registry
+from services.models import Child_services
+from .models import AdminNotification, Booking, BookingService, WaitlistEntry
+
+
+def promote_waitlist(dates=None, now=None):
+    """
+    Place holds (pending bookings) for waiting entries that now fit.
+
+    `dates` limits the pass to the dates where slots were freed; None sweeps
+    every date someone is waiting for. Entries and free slots are loaded with
+    one query each, then every date is matched in memory: entries in priority
+    order take the first free run inside their window, and what they take is
+    removed before the next entry is tried. Returns the promoted entry ids.
+    """
+    now = now or timezone.localtime()
+    today = now.date()
+
+    WaitlistEntry.objects.filter(status="waiting", slot_date__lt=today).update(status="expired")
+
+    entries = WaitlistEntry.objects.filter(status="waiting", slot_date__gte=today)
+    if dates is not None:
+        entries = entries.filter(slot_date__in=set(dates))
+
+    waiting = defaultdict(list)
+    for entry in entries.order_by("-priority", "created_at", "id"):
+        waiting[entry.slot_date].append(entry)
+    if not waiting:
+        return []
+
+    free = defaultdict(dict)  # date -> {slot_master_id: slot_id}
+    rows = DailySlot.objects.filter(
+        slot_date__in=list(waiting),
+        status="available",
+        is_holiday=False,
+        slot_master__is_active=True,
+    ).values_list("slot_date", "slot_master_id", "id")
+    for slot_date, master_id, slot_id in rows:
+        free[slot_date][master_id] = slot_id
+
+    registry = get_registry()
+    promoted, touched = [], set()
+
+    for slot_date, queue in sorted(waiting.items()):
+        by_master = free.get(slot_date)
+        not_before = now.time() if slot_date == today else None
+        no_fit = set()  # free slots only shrink during a pass, so a miss stays a miss
+
+        for entry in queue:
+            if not by_master:
+                break
+
+            shape = (registry.snap(entry.duration_minutes), entry.window_start, entry.window_end)
+            if shape in no_fit:
+                continue
+
+            fit = next(_feasible_starts(
+                registry, by_master.keys(), entry.duration_minutes,
+                entry.window_start, entry.window_end, not_before,
+            ), None)
+            if fit is None:
+                no_fit.add(shape)
+                continue
+
+            master_ids = registry.ids[fit[0]:fit[1] + 1]
+            if place_hold(entry, [by_master[sm_id] for sm_id in master_ids]):
+                promoted.append(entry.id)
+                touched.add(slot_date)
+
+            # Taken by this hold, or by a checkout that got there first
+            for sm_id in master_ids:
+                by_master.pop(sm_id, None)
+
+    # Holds claim slots with .update(), which skips the DailySlot signals
+    if touched:
+        availability.rebuild_summaries(touched)
+    return promoted
+
+
+def place_hold(entry, slot_ids):
+    """
+    Book `slot_ids` (one consecutive run, in start_time order) for `entry`
+    as a pending booking. False if any slot was taken meanwhile or the
+    entry is no longer waiting; nothing is written in that case.
+    """
+    services = list(Child_services.objects.filter(id__in=entry.service_ids))
+
+    with transaction.atomic():
+        claimed = DailySlot.objects.filter(id__in=slot_ids, status="available").update(
+            status="booked",
+            booked_by_id=entry.user_id,
+            booked_service=services[0] if services else None,
+        )
+        if claimed != len(slot_ids):
+            transaction.set_rollback(True)
+            return False
+
+        booking = Booking.objects.create(
+            user_id=entry.user_id,
+            start_slot_id=slot_ids[0],
+            status="pending",
+        )
+        BookingService.objects.bulk_create(
+            [BookingService(booking=booking, service=service) for service in services]
+        )
+        booking.calculate_totals()
+
+        taken = WaitlistEntry.objects.filter(pk=entry.pk, status="waiting").update(
+            status="promoted",
+            booking=booking,
+            promoted_at=timezone.now(),
+        )
+        if not taken:
+            transaction.set_rollback(True)
+            return False
+
+        AdminNotification.objects.create(
+            booking=booking,
+            message=f" Waitlist Booking #{booking.id} by {booking.user.username} on {entry.slot_date}"
+        )
+        transaction.on_commit(lambda: _notify_user(booking))
+
+    return True
+
+
+def _notify_user(booking):
+    send_mail(
+        f"A slot opened up - booking #{booking.id}",
+        f"Hello {booking.user.username},\n\nA slot on {booking.start_slot.slot_date} "
+        f"opened up and has been held for you as booking #{booking.id}, "
+        f"pending confirmation.\n\nThanks.",
+        settings.DEFAULT_FROM_EMAIL,
+        [booking.user.email],
+        fail_silently=True,
+    )
+
+
+def queue_promotion(dates):
+    """
+    Hand the freed `dates` to celery; called via transaction.on_commit once
+    slots are released (decline, expiry, cancellation).
+    """
+    from .tasks import promote_waitlist as promote_waitlist_task
+    dates = sorted({str(d) for d in dates})
+    try:
+        promote_waitlist_task.apply_async((dates,), retry=False)
+    except Exception:
+        # broker down: match inline rather than leave the slots idle
+        promote_waitlist([date.fromisoformat(d) for d in dates])
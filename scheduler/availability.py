@@ -0,0 +1,294 @@
+# scheduler/availability.py
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date
+
+from django.db import transaction
+
+from .models import DailySlot, DailyAvailabilitySummary
+from .slot_templates import get_registry
+from backend.conditional import bump
+
+
+_state = threading.local()
+
+
+def _summarise(slot_date, registry, slots_by_master):
+    """
+    Build a DailyAvailabilitySummary for one date.
+
+    `registry` holds the active templates in start_time order and
+    `slots_by_master` maps slot_master_id -> (slot_id, status, is_holiday).
+    A free run is a sequence of consecutive templates whose slots are all
+    available, the same rule CheckoutView uses to place a cart.
+    """
+    free_count = 0
+    first_free_time = None
+    longest, longest_start = 0, None
+    run, run_start = 0, None
+
+    for i, sm_id in enumerate(registry.ids):
+        slot = slots_by_master.get(sm_id)
+        is_free = bool(slot) and slot[1] == "available" and not slot[2]
+
+        if not is_free:
+            run, run_start = 0, None
+            continue
+
+        free_count += 1
+        if first_free_time is None:
+            first_free_time = registry.start_times[i]
+
+        if run_start is None:
+            run_start = slot[0]
+        run += registry.durations[i]
+
+        if run > longest:
+            longest, longest_start = run, run_start
+
+    return DailyAvailabilitySummary(
+        slot_date=slot_date,
+        free_count=free_count,
+        total_count=len(slots_by_master),
+        longest_free_run_minutes=longest,
+        longest_free_run_start_id=longest_start,
+        first_free_time=first_free_time,
+    )
+
+
+# Compared to tell whether a rebuilt summary differs from the stored row
+SUMMARY_FIELDS = (
+    "free_count",
+    "total_count",
+    "longest_free_run_minutes",
+    "longest_free_run_start_id",
+    "first_free_time",
+)
+
+
+def rebuild_summaries(dates):
+    """
+    Recompute the availability summary rows for the given dates with one
+    slot query and one upsert. Dates without any slots lose their row.
+
+    Only rows that actually differ are written, and "slots" is bumped only
+    then, so periodic rebuilds with nothing new keep the slot ETags valid.
+    Returns True if anything changed.
+    """
+    dates = sorted(set(dates))
+    if not dates:
+        return False
+
+    registry = get_registry()
+
+    slots = defaultdict(dict)
+    rows = DailySlot.objects.filter(
+        slot_date__in=dates,
+        slot_master__is_active=True
+    ).values_list("id", "slot_date", "slot_master_id", "status", "is_holiday")
+
+    for slot_id, slot_date, master_id, status, is_holiday in rows:
+        slots[slot_date][master_id] = (slot_id, status.lower(), is_holiday)
+
+    existing = {
+        row[0]: row[1:]
+        for row in DailyAvailabilitySummary.objects.filter(slot_date__in=dates)
+        .values_list("slot_date", *SUMMARY_FIELDS)
+    }
+
+    summaries = [
+        summary
+        for summary in (_summarise(d, registry, slots[d]) for d in dates if slots.get(d))
+        if existing.get(summary.slot_date) != tuple(getattr(summary, f) for f in SUMMARY_FIELDS)
+    ]
+    empty_dates = [d for d in dates if not slots.get(d) and d in existing]
+    if not summaries and not empty_dates:
+        return False
+
+    with transaction.atomic():
+        if empty_dates:
+            DailyAvailabilitySummary.objects.filter(slot_date__in=empty_dates).delete()
+        if summaries:
+            DailyAvailabilitySummary.objects.bulk_create(
+                summaries,
+                update_conflicts=True,
+                unique_fields=["slot_date"],
+                update_fields=[
+                    "free_count",
+                    "total_count",
+                    "longest_free_run_minutes",
+                    "longest_free_run_start",
+                    "first_free_time",
+                    "updated_at",
+                ],
+            )
+        # Every slot change ends up here, including .update() paths; a change
+        # in which slots are free always shows in the summary unless slots
+        # swapped within one date (callers doing that bump themselves)
+        bump("slots")
+    return True
+
+
+def mark_dirty(slot_date):
+    """
+    Refresh the summary for `slot_date`, or queue it when updates are deferred.
+    """
+    pending = getattr(_state, "pending", None)
+    if pending is not None:
+        pending.add(slot_date)
+        return
+    rebuild_summaries([slot_date])
+
+
+@contextmanager
+def deferred_summary_updates():
+    """
+    Collect summary refreshes triggered inside the block (e.g. by DailySlot
+    saves) and rebuild every touched date once, in bulk, on exit.
+    """
+    if getattr(_state, "pending", None) is not None:
+        # Nested: the outermost block does the rebuild
+        yield
+        return
+
+    _state.pending = set()
+    try:
+        yield
+    except Exception:
+        _state.pending = None
+        raise
+
+    dates = _state.pending
+    _state.pending = None
+    rebuild_summaries(dates)
+
+
+def _feasible_starts(registry, free_ids, duration_minutes, window_start=None, window_end=None, not_before=None):
+    """
+    Yield (start_index, end_index) for every run of consecutive free templates
+    starting at start_index that covers `duration_minutes`.
+
+    `free_ids` is the set of free slot_master ids for one date. The run has to
+    start at/after `window_start` (and `not_before`) and finish by `window_end`.
+    Run lengths come from the registry's fit table and are checked against a
+    bitmap of the free templates, so each start is one lookup and one AND.
+    """
+    free = registry.mask(free_ids)
+    for i, count in enumerate(registry.fit_counts(duration_minutes)):
+        if count is None:
+            break  # later starts can only cover fewer minutes
+
+        run = registry.run_mask(i, count)
+        if free & run != run:
+            continue
+
+        start_time = registry.start_times[i]
+        if window_start and start_time < window_start:
+            continue
+        if not_before and start_time <= not_before:
+            continue
+
+        j = i + count - 1
+        if window_end and registry.end_times[j] > window_end:
+            continue
+        yield i, j
+
+
+def soonest_start(duration_minutes, from_date=None):
+    """
+    Earliest start (from `from_date`, default today) where `duration_minutes`
+    fits into consecutive free slots: the first date whose summary shows a
+    long enough run, then the first fitting start on that date, which can be
+    earlier than the start of the longest run. None if nothing fits.
+    """
+    from_date = from_date or date.today()
+    slot_date = (
+        DailyAvailabilitySummary.objects
+        .filter(slot_date__gte=from_date, longest_free_run_minutes__gte=duration_minutes)
+        .order_by("slot_date")
+        .values_list("slot_date", flat=True)
+        .first()
+    )
+    if slot_date is None:
+        return None
+
+    registry = get_registry()
+    by_master = dict(
+        DailySlot.objects.filter(
+            slot_date=slot_date,
+            status__iexact="available",
+            is_holiday=False,
+            slot_master__is_active=True,
+        ).values_list("slot_master_id", "id")
+    )
+
+    fit = next(_feasible_starts(registry, by_master.keys(), duration_minutes), None)
+    if fit is None:
+        return None
+
+    i, j = fit
+    # The free run goes on past the cart as long as the next templates are free
+    end = j + 1
+    while end < len(registry.ids) and registry.ids[end] in by_master:
+        end += 1
+    return {
+        "date": str(slot_date),
+        "start_slot_id": by_master[registry.ids[i]],
+        "start_time": registry.start_times[i],
+        "free_run_minutes": registry.prefix[end] - registry.prefix[i],
+    }
+
+
+def find_next_available(duration_minutes, limit=5, from_date=None, window_start=None, window_end=None, now=None):
+    """
+    Earliest `limit` start slots, across all generated dates, where a cart of
+    `duration_minutes` fits into consecutive free slots.
+
+    Dates whose summary shows no long enough run are skipped; the rest are
+    fetched with one ranged DailySlot query and scanned in memory.
+    `now` (a datetime) hides slots that have already started today.
+    """
+    from_date = from_date or date.today()
+
+    candidate_dates = list(
+        DailyAvailabilitySummary.objects
+        .filter(slot_date__gte=from_date, longest_free_run_minutes__gte=duration_minutes)
+        .order_by("slot_date")
+        .values_list("slot_date", flat=True)
+    )
+    if not candidate_dates:
+        return []
+
+    registry = get_registry()
+
+    free = defaultdict(dict)  # date -> {slot_master_id: slot_id}
+    rows = DailySlot.objects.filter(
+        slot_date__range=(candidate_dates[0], candidate_dates[-1]),
+        status__iexact="available",
+        is_holiday=False,
+        slot_master__is_active=True,
+    ).values_list("slot_date", "slot_master_id", "id")
+    for slot_date, master_id, slot_id in rows:
+        free[slot_date][master_id] = slot_id
+
+    results = []
+    for slot_date in candidate_dates:
+        by_master = free.get(slot_date)
+        if not by_master:
+            continue
+
+        not_before = now.time() if now and slot_date == now.date() else None
+        for i, j in _feasible_starts(registry, by_master.keys(), duration_minutes,
+                                     window_start, window_end, not_before):
+            results.append({
+                "date": str(slot_date),
+                "start_slot_id": by_master[registry.ids[i]],
+                "start_time": registry.start_times[i],
+                "end_time": registry.end_times[j],
+                "slot_ids": [by_master[sm_id] for sm_id in registry.ids[i:j + 1]],
+            })
+            if len(results) >= limit:
+                return results
+
+    return results
@@ -0,0 +1,118 @@
+# scheduler/business_calendar.py
+import threading
+import time
+from datetime import date, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+
+from backend.conditional import versions
+
+from .models import Holiday, WorkingDay
+
+
+class BusinessCalendar:
+    """
+    Holidays for the next N months as a set and closed weekdays as a bitmask
+    (bit 0 = Monday ... bit 6 = Sunday), so open/closed checks need no queries.
+    """
+
+    def __init__(self, loaded_on, horizon, holidays, closed_weekdays_mask):
+        self.loaded_on = loaded_on
+        self.horizon = horizon
+        self.holidays = holidays
+        self.closed_weekdays_mask = closed_weekdays_mask
+        self.version = None  # "calendar" version it was loaded at (get_calendar)
+
+    @classmethod
+    def load(cls, months=None):
+        months = months or getattr(settings, "SCHEDULER_CALENDAR_MONTHS", 6)
+        today = date.today()
+        horizon = today + relativedelta(months=months)
+
+        holidays = set(
+            Holiday.objects.filter(holiday_date__range=(today, horizon))
+            .values_list("holiday_date", flat=True)
+        )
+
+        # First row per weekday wins, same as WorkingDay.objects.filter(weekday=..).first();
+        # no rows => all days working
+        mask = 0
+        seen = set()
+        for weekday, is_working in WorkingDay.objects.order_by("pk").values_list("weekday", "is_working"):
+            if weekday in seen:
+                continue
+            seen.add(weekday)
+            if not is_working:
+                mask |= 1 << weekday
+
+        return cls(today, horizon, holidays, mask)
+
+    def is_holiday(self, check_date):
+        if self.loaded_on <= check_date <= self.horizon:
+            return check_date in self.holidays
+        # Outside the cached window (past dates / far future): ask the table
+        return Holiday.objects.filter(holiday_date=check_date).exists()
+
+    def is_working_weekday(self, check_date):
+        return not (self.closed_weekdays_mask >> check_date.weekday()) & 1
+
+    def is_closed(self, check_date):
+        return self.is_holiday(check_date) or not self.is_working_weekday(check_date)
+
+    def is_open(self, check_date):
+        return not self.is_closed(check_date)
+
+    def open_dates(self, start, end):
+        """
+        Open dates between start and end (inclusive), in order.
+        """
+        days = (end - start).days + 1
+        return [
+            d for d in (start + timedelta(days=i) for i in range(days))
+            if self.is_open(d)
+        ]
+
+
+_calendar = None
+_checked_at = 0.0  # time.monotonic() of the last version check
+_lock = threading.Lock()
+
+
+def _check_seconds():
+    return getattr(settings, "SCHEDULER_CACHE_CHECK_SECONDS", 5)
+
+
+def get_calendar():
+    """
+    Process-wide calendar; reloaded after invalidation, when the day rolls
+    over, or when the "calendar" version has moved (Holiday/WorkingDay
+    changes in any process bump it). The version is compared at most every
+    SCHEDULER_CACHE_CHECK_SECONDS, so most calls run no query at all.
+    """
+    global _calendar, _checked_at
+    calendar = _calendar
+    if (calendar is not None and calendar.loaded_on == date.today()
+            and time.monotonic() - _checked_at < _check_seconds()):
+        return calendar
+
+    with _lock:
+        now = time.monotonic()
+        if (_calendar is None or _calendar.loaded_on != date.today()
+                or now - _checked_at >= _check_seconds()):
+            version = versions("calendar")
+            if _calendar is None or _calendar.loaded_on != date.today() or _calendar.version != version:
+                _calendar = BusinessCalendar.load()
+                _calendar.version = version
+            _checked_at = now
+        return _calendar
+
+
+def invalidate_calendar():
+    """
+    Wired to Holiday/WorkingDay post_save/post_delete in scheduler.signals,
+    which also bump "calendar" for the other processes.
+    """
+    global _calendar
+    with _lock:
+        _calendar = None
@@ -0,0 +1,134 @@
+# scheduler/maintenance.py
+import functools
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import MaintenanceRun
+
+
+logger = logging.getLogger(__name__)
+
+# A run that stops renewing its lease for this long is presumed dead and
+# may be taken over by another worker
+LEASE_SECONDS = getattr(settings, "MAINTENANCE_LEASE_SECONDS", 600)
+
+OWNER = f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+def acquire(job, run_date=None):
+    """
+    Take the lease for `job` on `run_date` (default today).
+
+    Returns the MaintenanceRun when this process should do the work, None
+    when the job already finished today or another live worker holds it.
+    A failed run, or one whose lease expired, is taken over.
+    """
+    run_date = run_date or timezone.localdate()
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=LEASE_SECONDS)
+
+    try:
+        with transaction.atomic():
+            return MaintenanceRun.objects.create(
+                job=job,
+                run_date=run_date,
+                owner=OWNER,
+                lease_until=lease_until,
+                started_at=now,
+            )
+    except IntegrityError:
+        pass
+
+    taken = MaintenanceRun.objects.filter(job=job, run_date=run_date).filter(
+        Q(status="failed") | Q(status="running", lease_until__lt=now)
+    ).update(status="running", owner=OWNER, lease_until=lease_until, started_at=now, finished_at=None)
+    if not taken:
+        return None
+    return MaintenanceRun.objects.get(job=job, run_date=run_date)
+
+
+def renew(run):
+    """
+    Extend the lease while a long job is still working. False if another
+    worker took it over meanwhile; the caller should stop.
+    """
+    return bool(MaintenanceRun.objects.filter(pk=run.pk, owner=OWNER, status="running").update(
+        lease_until=timezone.now() + timedelta(seconds=LEASE_SECONDS)
+    ))
+
+
+def save_checkpoint(run, checkpoint):
+    """
+    Record progress and renew the lease in one write. False if another
+    worker took the run over; the caller should stop.
+    """
+    run.checkpoint = checkpoint
+    return bool(MaintenanceRun.objects.filter(pk=run.pk, owner=OWNER, status="running").update(
+        checkpoint=checkpoint,
+        lease_until=timezone.now() + timedelta(seconds=LEASE_SECONDS),
+    ))
+
+
+def finish(run, status, result=""):
+    MaintenanceRun.objects.filter(pk=run.pk, owner=OWNER).update(
+        status=status,
+        finished_at=timezone.now(),
+        result=str(result)[:2000],
+    )
+
+
+def _heartbeat(run, stop):
+    """
+    Renew the lease every third of LEASE_SECONDS until `stop` is set, so a
+    job running longer than the lease is not taken over mid-run.
+    """
+    try:
+        while not stop.wait(LEASE_SECONDS / 3):
+            if not renew(run):
+                logger.warning("Lease for %s on %s was taken over", run.job, run.run_date)
+                return
+    except Exception:
+        logger.exception("Could not renew the lease for %s", run.job)
+    finally:
+        connections.close_all()  # this thread's connections only
+
+
+def once_per_day(job):
+    """
+    Run the decorated function at most once per day across all processes.
+    Other callers that day get "SKIPPED" without doing any work. The run is
+    logged in MaintenanceRun and its lease renewed from a heartbeat thread
+    while the function runs; if the function raises it is marked failed,
+    so the next call retries.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            run = acquire(job)
+            if run is None:
+                return "SKIPPED: already done or running today"
+
+            stop = threading.Event()
+            heartbeat = threading.Thread(target=_heartbeat, args=(run, stop), name=f"lease:{job}", daemon=True)
+            heartbeat.start()
+            try:
+                try:
+                    result = fn(*args, **kwargs)
+                finally:
+                    stop.set()
+                    heartbeat.join()
+            except Exception as e:
+                finish(run, "failed", repr(e))
+                raise
+            finish(run, "done", result if result is not None else "")
+            return result
+        return wrapper
+    return decorator
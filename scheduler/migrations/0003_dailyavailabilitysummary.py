@@ -0,0 +1,72 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:34
+
+import django.db.models.deletion
+from collections import defaultdict
+from datetime import date, datetime
+
+from django.db import migrations, models
+
+
+def backfill_summaries(apps, schema_editor):
+    SlotMaster = apps.get_model('scheduler', 'SlotMaster')
+    DailySlot = apps.get_model('scheduler', 'DailySlot')
+    DailyAvailabilitySummary = apps.get_model('scheduler', 'DailyAvailabilitySummary')
+
+    masters = list(SlotMaster.objects.filter(is_active=True).order_by('start_time'))
+    slots = defaultdict(dict)
+    for slot_id, slot_date, master_id, status, is_holiday in DailySlot.objects.filter(
+        slot_master__is_active=True
+    ).values_list('id', 'slot_date', 'slot_master_id', 'status', 'is_holiday'):
+        slots[slot_date][master_id] = (slot_id, status.lower(), is_holiday)
+
+    summaries = []
+    for slot_date, by_master in slots.items():
+        free = 0
+        first_free = None
+        longest, longest_start, run, run_start = 0, None, 0, None
+        for sm in masters:
+            slot = by_master.get(sm.id)
+            if not slot or slot[1] != 'available' or slot[2]:
+                run, run_start = 0, None
+                continue
+            free += 1
+            first_free = first_free or sm.start_time
+            minutes = int((datetime.combine(date.today(), sm.end_time)
+                           - datetime.combine(date.today(), sm.start_time)).total_seconds() // 60)
+            run += minutes if minutes > 0 else 30
+            run_start = run_start or slot[0]
+            if run > longest:
+                longest, longest_start = run, run_start
+        summaries.append(DailyAvailabilitySummary(
+            slot_date=slot_date,
+            free_count=free,
+            total_count=len(by_master),
+            longest_free_run_minutes=longest,
+            longest_free_run_start_id=longest_start,
+            first_free_time=first_free,
+        ))
+    DailyAvailabilitySummary.objects.bulk_create(summaries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0002_alter_dailyslot_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAvailabilitySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot_date', models.DateField(unique=True)),
+                ('free_count', models.PositiveIntegerField(default=0)),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('longest_free_run_minutes', models.PositiveIntegerField(default=0)),
+                ('first_free_time', models.TimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('longest_free_run_start', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='scheduler.dailyslot')),
+            ],
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -75,3 +75,88 @@ class DailySlot(models.Model):
         return f"{self.slot_date} | {self.slot_master.start_time}-{self.slot_master.end_time} | {self.status}"
 
 
+# 5. Daily availability summary (materialised per date from DailySlot)
+class DailyAvailabilitySummary(models.Model):
+    slot_date = models.DateField(unique=True)
+    free_count = models.PositiveIntegerField(default=0)
+    total_count = models.PositiveIntegerField(default=0)
+    longest_free_run_minutes = models.PositiveIntegerField(default=0)
+    longest_free_run_start = models.ForeignKey(
+        DailySlot,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+"
+    )
+    first_free_time = models.TimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.slot_date} | {self.free_count}/{self.total_count} free | run {self.longest_free_run_minutes}m"
+
+
+# 6. Content version counters (cheap ETags, see backend/conditional.py)
+class ContentVersion(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+# 7. Maintenance run log / lease (see scheduler/maintenance.py)
+class MaintenanceRun(models.Model):
+    """
+    One row per (job, day). Creating the row is the lease: only the process
+    that inserts it (or takes over an expired/failed one) runs the job, so
+    adding workers doesn't repeat the daily work.
+    """
+    STATUS_CHOICES = (
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    )
+
+    job = models.CharField(max_length=50)
+    run_date = models.DateField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+    owner = models.CharField(max_length=100)  # host:pid holding the lease
+    lease_until = models.DateTimeField()
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    result = models.TextField(blank=True)
+    # Progress of batched jobs, so a taken-over run resumes where it stopped
+    checkpoint = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('job', 'run_date')
+
+    def __str__(self):
+        return f"{self.job} {self.run_date} | {self.status}"
+
+
+# 8. Past slots moved out of DailySlot by the purge job (scheduler/purge.py)
+class ArchivedDailySlot(models.Model):
+    original_id = models.BigIntegerField(unique=True)
+    slot_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    status = models.CharField(max_length=20)
+    is_holiday = models.BooleanField(default=False)
+    booked_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+"
+    )
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['slot_date']),
+        ]
+
+    def __str__(self):
+        return f"{self.slot_date} | {self.start_time}-{self.end_time} | {self.status} (archived)"
@@ -0,0 +1,94 @@
+# scheduler/purge.py
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from booking.models import Booking
+from . import availability, maintenance
+from .models import ArchivedDailySlot, DailySlot
+
+
+PURGE_BATCH_SIZE = getattr(settings, "SLOT_PURGE_BATCH_SIZE", 500)
+
+
+def purge_past_slots(batch_size=PURGE_BATCH_SIZE):
+    """
+    Copy DailySlots from before today into ArchivedDailySlot and delete them,
+    `batch_size` rows per short transaction, in id order.
+
+    Progress (last id handled, counts) is checkpointed on the day's
+    MaintenanceRun after every batch, so a run that dies is resumed by the
+    next worker from where it stopped instead of starting over. Slots still
+    referenced by a booking are left alone: deleting them would cascade into
+    Booking (they go once the booking itself is archived).
+    """
+    run = maintenance.acquire("purge_past_slots")
+    if run is None:
+        return "SKIPPED: already done or running today"
+
+    progress = run.checkpoint or {"last_id": 0, "archived": 0, "kept": 0}
+    today = timezone.localdate()
+
+    try:
+        while True:
+            rows = list(
+                DailySlot.objects
+                .filter(slot_date__lt=today, id__gt=progress["last_id"])
+                .order_by("id")
+                .values_list(
+                    "id", "slot_date", "slot_master__start_time", "slot_master__end_time",
+                    "status", "is_holiday", "booked_by_id",
+                )[:batch_size]
+            )
+            if not rows:
+                break
+
+            ids = [row[0] for row in rows]
+
+            # Per-slot post_delete summary refreshes are collapsed into one
+            # rebuild per batch (which also drops the past dates' rows)
+            with transaction.atomic(), availability.deferred_summary_updates():
+                # Lock the batch before looking for bookings: a new booking's
+                # FK check waits on the lock (SQLite: the write lock is already
+                # held), so none can appear between the check and the delete
+                # and be cascade-deleted with its slot
+                list(DailySlot.objects.select_for_update().filter(id__in=ids).values_list("id", flat=True))
+                referenced = set(
+                    Booking.objects.filter(start_slot_id__in=ids).values_list("start_slot_id", flat=True)
+                )
+                archive = [row for row in rows if row[0] not in referenced]
+
+                ArchivedDailySlot.objects.bulk_create(
+                    [
+                        ArchivedDailySlot(
+                            original_id=pk,
+                            slot_date=slot_date,
+                            start_time=start_time,
+                            end_time=end_time,
+                            status=status,
+                            is_holiday=is_holiday,
+                            booked_by_id=booked_by_id,
+                        )
+                        for pk, slot_date, start_time, end_time, status, is_holiday, booked_by_id in archive
+                    ],
+                    ignore_conflicts=True,  # re-run of a batch whose checkpoint was lost
+                )
+                DailySlot.objects.filter(id__in=[row[0] for row in archive]).exclude(
+                    Exists(Booking.objects.filter(start_slot_id=OuterRef("pk")))
+                ).delete()
+
+            progress = {
+                "last_id": ids[-1],
+                "archived": progress["archived"] + len(archive),
+                "kept": progress["kept"] + len(referenced),
+            }
+            if not maintenance.save_checkpoint(run, progress):
+                return "STOPPED: lease taken over by another worker"
+    except Exception as e:
+        maintenance.finish(run, "failed", repr(e))
+        raise
+
+    result = f"Archived {progress['archived']} past slots, kept {progress['kept']} with bookings"
+    maintenance.finish(run, "done", result)
+    return result
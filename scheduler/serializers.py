@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import WorkingDay, Holiday, SlotMaster, DailySlot
 from services.models import Child_services
+from backend.serialization import Field, Nested, ValuesSerializer, iso
 
 
 class WorkingDaySerializer(serializers.ModelSerializer):
@@ -42,7 +43,21 @@ class DailySlotSerializer(serializers.ModelSerializer):
         return None
 
 
-
-
-
-
+# Same JSON as DailySlotSerializer, built from values_list rows (DailySlotListAPIView)
+DAILY_SLOT_ROWS = ValuesSerializer({
+    "id": Field("id"),
+    "slot_master": Nested({
+        "id": Field("slot_master_id"),
+        "start_time": Field("slot_master__start_time", iso),
+        "end_time": Field("slot_master__end_time", iso),
+        "is_active": Field("slot_master__is_active"),
+    }),
+    "slot_date": Field("slot_date", iso),
+    "status": Field("status"),
+    # str(user) is "username (role)"
+    "booked_by": Field(("booked_by__username", "booked_by__role__name"), lambda user, role: f"{user} ({role})"),
+    "booked_service": Nested({
+        "id": Field("booked_service_id"),
+        "name": Field("booked_service__child_service_name"),
+    }, null_if="booked_service_id"),
+})
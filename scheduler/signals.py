@@ -1,32 +1,41 @@
 # scheduler/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
 
 from .models import SlotMaster, DailySlot, Holiday, WorkingDay
+from . import availability
+from .slot_templates import invalidate_registry
+from .business_calendar import get_calendar, invalidate_calendar
+from backend.conditional import bump
 
 
 def _is_closed(check_date):
-    # Holiday check (Holiday model uses holiday_date)
-    if Holiday.objects.filter(holiday_date=check_date).exists():
-        return True
+    # Holiday or non-working weekday; WorkingDay empty => all days working
+    return get_calendar().is_closed(check_date)
 
-    # WorkingDay check if table has rows; if none => assume all days working
-    if WorkingDay.objects.exists():
-        wd = WorkingDay.objects.filter(weekday=check_date.weekday()).first()
-        return bool(wd and not wd.is_working)
 
-    return False
+@receiver(post_save, sender=Holiday)
+@receiver(post_delete, sender=Holiday)
+@receiver(post_save, sender=WorkingDay)
+@receiver(post_delete, sender=WorkingDay)
+def reload_business_calendar(sender, instance, **kwargs):
+    invalidate_calendar()
+    bump("calendar", "slots")  # other processes reload their calendar on the new version
 
 
 @receiver(post_save, sender=SlotMaster)
+@availability.deferred_summary_updates()
 def ensure_slots_for_recent_days(sender, instance, created, **kwargs):
     """
     When a SlotMaster is created/updated → ensure DailySlot exists for
     today, tomorrow and day-after-tomorrow. If already exists, update
     status (unless booked).
     """
+    invalidate_registry()
+    bump("templates", "slots")  # other processes reload their registry on the new version
+
     today = timezone.localdate()
     dates = [today, today + timedelta(days=1), today + timedelta(days=2)]
 
@@ -50,4 +59,22 @@ def ensure_slots_for_recent_days(sender, instance, created, **kwargs):
                 obj.is_holiday = is_closed
                 obj.save()
 
-                
+    # Template set changed → every generated date's runs may have changed
+    for d in DailySlot.objects.filter(slot_date__gte=today).values_list("slot_date", flat=True).distinct():
+        availability.mark_dirty(d)
+
+
+@receiver(post_delete, sender=SlotMaster)
+def drop_deleted_slot_template(sender, instance, **kwargs):
+    invalidate_registry()
+    bump("templates", "slots")
+
+
+@receiver(post_save, sender=DailySlot)
+@receiver(post_delete, sender=DailySlot)
+def refresh_availability_summary(sender, instance, **kwargs):
+    """
+    Keep DailyAvailabilitySummary in step with slot changes. Runs inside the
+    caller's transaction so the summary commits (or rolls back) with the slot.
+    """
+    availability.mark_dirty(instance.slot_date)
@@ -2,10 +2,12 @@
 
 from django.utils.timezone import now
 from scheduler.models import DailySlot
+from scheduler import availability
 from django.db.models import Q
+from scheduler.maintenance import once_per_day
 
-_last_reset_date = None
 
+@once_per_day("auto_reset_slots")  # once per day across all processes (MaintenanceRun)
 def auto_reset_slots():
     """
     Resets slots daily at midnight.
@@ -14,13 +16,8 @@ def auto_reset_slots():
     ✔ past dates → blocked
     """
 
-    global _last_reset_date
     today = now().date()
 
-    # Avoid running twice in same process day
-    if _last_reset_date == today:
-        return
-
     # 1️⃣ Reset booked slots for TODAY & FUTURE
     DailySlot.objects.filter(
         Q(slot_date__gte=today) & Q(status__iexact="booked")
@@ -35,6 +32,11 @@ def auto_reset_slots():
         slot_date__lt=today
     ).exclude(status="blocked").update(status="blocked")
 
-    _last_reset_date = today
+    # Bulk updates bypass DailySlot signals → rebuild summaries for every date
+    availability.rebuild_summaries(
+        DailySlot.objects.values_list("slot_date", flat=True).distinct()
+    )
+
     print("DailySlot reset completed for:", today)
+    return f"DailySlot reset completed for: {today}"
 
@@ -0,0 +1,158 @@
+# scheduler/slot_templates.py
+import threading
+import time
+from bisect import bisect_left
+from functools import reduce
+from math import gcd
+
+from django.conf import settings
+
+from backend.conditional import versions
+
+from .models import SlotMaster
+
+
+class SlotTemplateRegistry:
+    """
+    Active SlotMasters ordered by start_time, kept as plain lists:
+    minute offsets from midnight, per-template durations and their prefix sums.
+
+    prefix[i] is the total minutes of templates 0..i-1, so the minutes covered
+    by templates i..j is prefix[j + 1] - prefix[i].
+
+    Every template is a whole number of `grid` minutes long, so any duration
+    needs as many templates as the next multiple of `grid`. `fits` maps each
+    such multiple (up to the whole day) to the per-start-template count of
+    templates needed, None where the day runs out first.
+    """
+
+    def __init__(self, masters):
+        self.version = None  # "templates" version it was loaded at (get_registry)
+        self.ids = [sm.id for sm in masters]
+        self.start_times = [sm.start_time for sm in masters]
+        self.end_times = [sm.end_time for sm in masters]
+        self.start_minutes = [t.hour * 60 + t.minute for t in self.start_times]
+        self.end_minutes = [t.hour * 60 + t.minute for t in self.end_times]
+
+        # Same fallback as checkout: assume 30 minutes if bad data
+        self.durations = [
+            (end - start) if end > start else 30
+            for start, end in zip(self.start_minutes, self.end_minutes)
+        ]
+
+        self.prefix = [0]
+        for minutes in self.durations:
+            self.prefix.append(self.prefix[-1] + minutes)
+
+        self.index = {sm_id: i for i, sm_id in enumerate(self.ids)}
+
+        self.grid = reduce(gcd, self.durations, 0) or 30
+        self.fits = {
+            minutes: [self._count(i, minutes) for i in range(len(self.ids))]
+            for minutes in range(self.grid, self.prefix[-1] + 1, self.grid)
+        }
+        self._no_fit = [None] * len(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _count(self, start_index, required_minutes):
+        target = self.prefix[start_index] + required_minutes
+        end = bisect_left(self.prefix, target, lo=start_index + 1)
+        if end >= len(self.prefix):
+            return None
+        return end - start_index
+
+    def snap(self, minutes):
+        """`minutes` rounded up to the slot grid (at least one grid step)."""
+        return max(-(-minutes // self.grid), 1) * self.grid
+
+    def fit_counts(self, required_minutes):
+        """
+        Fit table row for this duration: templates needed from each start
+        template, None where it doesn't fit before the day ends.
+        """
+        return self.fits.get(self.snap(required_minutes), self._no_fit)
+
+    def required_range(self, start_index, required_minutes):
+        """
+        Index of the last template needed so that templates start_index..end
+        cover `required_minutes`, or None if the day runs out first.
+        """
+        count = self.fit_counts(required_minutes)[start_index]
+        if count is None:
+            return None
+        return start_index + count - 1
+
+    def mask(self, free_ids):
+        """Bitmap of the given slot_master ids: bit i set = template i."""
+        bits = 0
+        for sm_id in free_ids:
+            i = self.index.get(sm_id)
+            if i is not None:
+                bits |= 1 << i
+        return bits
+
+    @staticmethod
+    def run_mask(start_index, count):
+        return ((1 << count) - 1) << start_index
+
+    def required_ids(self, start_slot_master_id, required_minutes):
+        """
+        Consecutive slot_master ids starting at `start_slot_master_id` that
+        together cover `required_minutes`; empty list if they don't fit.
+        """
+        start_index = self.index.get(start_slot_master_id)
+        if start_index is None:
+            return []
+
+        end_index = self.required_range(start_index, required_minutes)
+        if end_index is None:
+            return []
+        return self.ids[start_index:end_index + 1]
+
+
+_registry = None
+_checked_at = 0.0  # time.monotonic() of the last version check
+_lock = threading.Lock()
+
+
+def _check_seconds():
+    return getattr(settings, "SCHEDULER_CACHE_CHECK_SECONDS", 5)
+
+
+def get_registry():
+    """
+    Process-wide registry, loaded from the database on first use.
+
+    SlotMaster changes bump the "templates" version; this process compares
+    it at most every SCHEDULER_CACHE_CHECK_SECONDS and reloads when it has
+    moved. The process that saved the change reloads at once (invalidate_registry).
+    """
+    global _registry, _checked_at
+    registry = _registry
+    if registry is not None and time.monotonic() - _checked_at < _check_seconds():
+        return registry
+
+    with _lock:
+        now = time.monotonic()
+        if _registry is None or now - _checked_at >= _check_seconds():
+            version = versions("templates")
+            if _registry is None or _registry.version != version:
+                _registry = SlotTemplateRegistry(
+                    list(SlotMaster.objects.filter(is_active=True).order_by("start_time"))
+                )
+                _registry.version = version
+            _checked_at = now
+        return _registry
+
+
+def invalidate_registry():
+    """
+    Drop the cached templates; the next get_registry() reloads them.
+    Wired to SlotMaster post_save/post_delete in scheduler.signals, which
+    also bump "templates" for the other processes.
+    """
+    global _registry
+    with _lock:
+        _registry = None
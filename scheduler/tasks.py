@@ -3,17 +3,21 @@ from datetime import timedelta
 from celery import shared_task
 from django.db import transaction
 
-from .models import SlotMaster, DailySlot, WorkingDay, Holiday
+from .models import SlotMaster, DailySlot, DailyAvailabilitySummary
+from . import availability
+from .business_calendar import get_calendar
+from .maintenance import once_per_day
+from . import purge
 
 @shared_task
+@once_per_day("generate_rolling_slots")  # every worker may fire it, only one runs it
+@availability.deferred_summary_updates()  # slot saves only queue their date; rebuilt in bulk on return
 def generate_rolling_slots(window_days=3):
 
     today = timezone.localdate()
     now_time = timezone.localtime().time()
 
-    # 1️⃣ DELETE YESTERDAY'S SLOTS
-    yesterday = today - timedelta(days=1)
-    DailySlot.objects.filter(slot_date__lt=today).delete()
+    # 1️⃣ Past slots are archived and deleted in batches by purge_past_slots
 
     # 2️⃣ EXPIRE TODAY'S PAST TIME SLOTS
     DailySlot.objects.filter(
@@ -25,12 +29,11 @@ def generate_rolling_slots(window_days=3):
     # 3️⃣ CALCULATE THE ROLLING DATES (today + next days)
     dates = [today + timedelta(days=i) for i in range(window_days)]
     masters = SlotMaster.objects.filter(is_active=True)
+    calendar = get_calendar()
 
     for date in dates:
-        weekday = date.weekday()
-        is_holiday = Holiday.objects.filter(holiday_date=date).exists()
-        wd = WorkingDay.objects.filter(weekday=weekday).first()
-        is_closed = bool(wd and not wd.is_working)
+        is_holiday = calendar.is_holiday(date)
+        is_closed = not calendar.is_working_weekday(date)
 
         # default slot status
         default_status = "blocked" if (is_holiday or is_closed) else "available"
@@ -66,7 +69,17 @@ def generate_rolling_slots(window_days=3):
                 slot.is_holiday = is_holiday
                 slot.save()
 
-    return "SUCCESS: New day created & old day removed"
+    # Past dates no longer need a summary row
+    DailyAvailabilitySummary.objects.filter(slot_date__lt=today).delete()
+    for date in dates:
+        availability.mark_dirty(date)
+
+    return "SUCCESS: New day created"
+
+@shared_task
+def purge_past_slots():
+    return purge.purge_past_slots()
+
 
 @shared_task
 def watch_and_expire_slots():
@@ -80,4 +93,7 @@ def watch_and_expire_slots():
         slot_master__end_time__lt=now_time
     ).update(status="expired")
 
+    # .update() skips the DailySlot signals, refresh today's summary explicitly
+    availability.rebuild_summaries([today])
+
     return "Expired today's finished slots"
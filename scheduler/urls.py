@@ -6,6 +6,7 @@ from .views import (
     WorkingDayViewSet,
     DailySlotListAPIView,
     AvailableDatesAPIView,
+    SoonestSlotAPIView,
 )
 
 router = DefaultRouter()
@@ -17,4 +18,5 @@ urlpatterns = [
     path('', include(router.urls)),
     path('slots/', DailySlotListAPIView.as_view(), name='daily-slots'),
     path('available-dates/', AvailableDatesAPIView.as_view(), name='available-dates'),
+    path('soonest-slot/', SoonestSlotAPIView.as_view(), name='soonest-slot'),
 ]
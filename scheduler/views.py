@@ -9,13 +9,18 @@ from datetime import timedelta, date,datetime
 
 from .models import WorkingDay, Holiday, DailySlot
 
-from .models import SlotMaster, WorkingDay, Holiday, DailySlot
+from .models import SlotMaster, WorkingDay, Holiday, DailySlot, DailyAvailabilitySummary
+from .availability import soonest_start
+from .business_calendar import get_calendar
 from .serializers import (
     SlotMasterSerializer,
     WorkingDaySerializer,
     HolidaySerializer,
-    DailySlotSerializer
+    DailySlotSerializer,
+    DAILY_SLOT_ROWS,
 )
+from backend.serialization import FastListMixin
+from backend.conditional import conditional_get
 
 
 class SlotMasterViewSet(viewsets.ModelViewSet):
@@ -39,8 +44,9 @@ class HolidayViewSet(viewsets.ModelViewSet):
 from rest_framework import status
 from rest_framework.response import Response
 
-class DailySlotListAPIView(generics.ListAPIView):
+class DailySlotListAPIView(FastListMixin, generics.ListAPIView):
     serializer_class = DailySlotSerializer
+    fast_serializer = DAILY_SLOT_ROWS
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
@@ -56,7 +62,7 @@ class DailySlotListAPIView(generics.ListAPIView):
             return DailySlot.objects.none()
 
         # Skip holiday date
-        if Holiday.objects.filter(holiday_date=date_obj).exists():
+        if get_calendar().is_holiday(date_obj):
             return DailySlot.objects.none()
 
         # Return available slots for date
@@ -67,6 +73,7 @@ class DailySlotListAPIView(generics.ListAPIView):
         .select_related("slot_master") \
         .order_by("slot_master__start_time")
 
+    @conditional_get("slots")
     def list(self, request, *args, **kwargs):
         date_str = request.query_params.get("date")
 
@@ -81,31 +88,48 @@ class DailySlotListAPIView(generics.ListAPIView):
 class AvailableDatesAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
+    @conditional_get("slots", period=300)
     def get(self, request):
         today = date.today()
-        available_dates = []
-
-        for i in range(0, 60):  # next 60 days
-            current_date = today + timedelta(days=i)
-            weekday = current_date.weekday()  # 0 = Monday ... 6 = Sunday
-
-            # 1️⃣ Skip holidays
-            if Holiday.objects.filter(holiday_date=current_date).exists():
-                continue
-
-            # 2️⃣ If WorkingDay table exists → use it
-            if WorkingDay.objects.exists():
-                wd = WorkingDay.objects.filter(weekday=weekday).first()
-                if wd and not wd.is_working:
-                    continue
-            # else → assume ALL DAYS ARE WORKING
-
-            # 3️⃣ Has at least 1 available slot?
-            if DailySlot.objects.filter(
-                slot_date=current_date,
-                status__iexact="available",
-                is_holiday=False
-            ).exists():
-                available_dates.append(str(current_date))
+        last_day = today + timedelta(days=59)  # next 60 days
+
+        # Optional: only dates that can hold a cart of this many minutes
+        try:
+            duration = int(request.query_params.get("duration", 0))
+        except ValueError:
+            return Response({"message": "duration must be a number of minutes"}, status=400)
+
+        # 1️⃣ Skip holidays and closed weekdays (cached calendar, no queries)
+        open_dates = set(get_calendar().open_dates(today, last_day))
+
+        # 2️⃣ Dates with at least 1 available slot, straight from the summary table
+        summaries = DailyAvailabilitySummary.objects.filter(
+            slot_date__range=(today, last_day),
+            free_count__gt=0,
+            longest_free_run_minutes__gte=duration,
+        ).values_list("slot_date", flat=True).order_by("slot_date")
+
+        available_dates = [str(d) for d in summaries if d in open_dates]
 
         return Response({"available_dates": available_dates})
+
+
+class SoonestSlotAPIView(APIView):
+    """
+    GET ?duration=90 → earliest date with a free run long enough for the
+    duration, and the first slot on it where the duration fits.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    @conditional_get("slots", period=60)
+    def get(self, request):
+        try:
+            duration = int(request.query_params.get("duration", ""))
+        except ValueError:
+            return Response({"message": "duration parameter is required (minutes)"}, status=400)
+
+        soonest = soonest_start(duration)
+        if soonest is None:
+            return Response({"message": "No free slots for this duration"}, status=404)
+
+        return Response(soonest)
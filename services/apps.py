@@ -5,6 +5,9 @@ class ServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'services'
 
+    def ready(self):
+        import services.signals
+
     # def ready(self):
     #     from .models import Gender
     #     # Ensure Male & Female always exist
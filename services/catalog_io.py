@@ -0,0 +1,250 @@
+# services/catalog_io.py
+"""
+Bulk import/export of the service catalog as flat rows, one per child
+service (rows with an empty child_service only create the main service):
+
+    gender, main_service, main_service_description,
+    child_service, child_service_description, price, duration
+"""
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .models import Gender, MainServices, Child_services
+from .search import invalidate_index
+from backend.conditional import bump
+
+
+FIELDS = [
+    "gender",
+    "main_service",
+    "main_service_description",
+    "child_service",
+    "child_service_description",
+    "price",
+    "duration",
+]
+
+
+class CatalogImportError(Exception):
+    """
+    The batch was rejected; `errors` is a list of {"row": n, "errors": {field: [msg]}}.
+    Nothing is written when this is raised.
+    """
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid row(s)")
+        self.errors = errors
+
+
+def read_rows(data, file_type):
+    """
+    Parse an uploaded CSV or JSON document (str/bytes) into row dicts.
+    JSON may be a list of rows or {"rows": [...]}.
+    """
+    if isinstance(data, bytes):
+        data = data.decode("utf-8-sig")
+    if file_type == "csv":
+        return list(csv.DictReader(io.StringIO(data)))
+
+    parsed = json.loads(data)
+    if isinstance(parsed, dict):
+        parsed = parsed.get("rows", [])
+    if not isinstance(parsed, list):
+        raise ValueError("Expected a list of rows")
+    return parsed
+
+
+def _clean(row, genders):
+    """
+    Validate one row in memory. Returns (cleaned, errors).
+    """
+    errors = {}
+
+    def text(field):
+        value = row.get(field)
+        return str(value).strip() if value is not None else ""
+
+    gender = genders.get(text("gender").lower())
+    if gender is None:
+        errors["gender"] = [f"Unknown gender. Use one of: {', '.join(sorted(genders))}."]
+
+    main_name = text("main_service")
+    if not main_name:
+        errors["main_service"] = ["This field is required."]
+    elif len(main_name) > 100:
+        errors["main_service"] = ["Ensure this field has no more than 100 characters."]
+
+    child_name = text("child_service")
+    price = duration = None
+    if child_name:
+        if len(child_name) > 100:
+            errors["child_service"] = ["Ensure this field has no more than 100 characters."]
+        try:
+            price = Decimal(text("price"))
+            if price <= 0 or price >= Decimal("1000000") or price.as_tuple().exponent < -2:
+                raise InvalidOperation
+        except InvalidOperation:
+            errors["price"] = ["Price must be a number greater than 0 with at most 2 decimals."]
+        try:
+            duration = int(text("duration") or 30)
+            if duration <= 0:
+                raise ValueError
+        except ValueError:
+            errors["duration"] = ["Duration must be a positive number of minutes."]
+
+    return {
+        "gender": gender,
+        "main_name": main_name,
+        "main_description": text("main_service_description"),
+        "child_name": child_name,
+        "child_description": text("child_service_description"),
+        "price": price,
+        "duration": duration,
+    }, errors
+
+
+def import_catalog(rows, skip_existing=False):
+    """
+    Validate the whole batch, then create the missing main services and the
+    child services with bulk_create in one transaction.
+
+    Existing main services (same gender, case-insensitive name) are reused.
+    A child service that already exists under its main service is an error,
+    or silently skipped with `skip_existing`.
+    Returns {"main_services_created": n, "child_services_created": n, "skipped": n}.
+    """
+    genders = {g.name.lower(): g for g in Gender.objects.all()}
+
+    cleaned, errors = [], []
+    seen = set()
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({"row": number, "errors": {"non_field_errors": ["Expected an object."]}})
+            continue
+        item, row_errors = _clean(row, genders)
+        if not row_errors and item["child_name"]:
+            key = (item["gender"].id, item["main_name"].lower(), item["child_name"].lower())
+            if key in seen:
+                row_errors["child_service"] = ["Duplicate of an earlier row."]
+            seen.add(key)
+        if row_errors:
+            errors.append({"row": number, "errors": row_errors})
+        cleaned.append((number, item))
+
+    if errors:
+        raise CatalogImportError(errors)
+
+    # One query: existing main services of these genders with their child names
+    mains = {}      # (gender_id, name lower) -> main id
+    children = set()  # (main id, child name lower)
+    existing = MainServices.objects.filter(
+        gender_id__in={item["gender"].id for _, item in cleaned}
+    ).values_list("id", "gender_id", "main_services_name", "child_services__child_service_name")
+    for main_id, gender_id, main_name, child_name in existing:
+        mains[(gender_id, main_name.lower())] = main_id
+        if child_name:
+            children.add((main_id, child_name.lower()))
+
+    new_mains = {}
+    new_children = []  # (main key, Child_services)
+    skipped = 0
+    for number, item in cleaned:
+        main_key = (item["gender"].id, item["main_name"].lower())
+        if main_key not in mains and main_key not in new_mains:
+            new_mains[main_key] = MainServices(
+                gender=item["gender"],
+                main_services_name=item["main_name"],
+                main_services_description=item["main_description"],
+            )
+        if not item["child_name"]:
+            continue
+
+        if (mains.get(main_key), item["child_name"].lower()) in children:
+            if skip_existing:
+                skipped += 1
+                continue
+            errors.append({"row": number, "errors": {
+                "child_service": ["A child service with this name already exists under this main service."]
+            }})
+            continue
+
+        new_children.append((main_key, Child_services(
+            gender=item["gender"],
+            child_service_name=item["child_name"],
+            child_service_description=item["child_description"],
+            price=item["price"],
+            duration=item["duration"],
+        )))
+
+    if errors:
+        raise CatalogImportError(errors)
+
+    with transaction.atomic():
+        MainServices.objects.bulk_create(new_mains.values())
+        for key, main in new_mains.items():
+            mains[key] = main.pk
+        for main_key, child in new_children:
+            child.main_services_id = mains[main_key]
+        Child_services.objects.bulk_create([child for _, child in new_children])
+
+        # bulk_create sends no post_save
+        bump("catalog")
+    invalidate_index()
+
+    return {
+        "main_services_created": len(new_mains),
+        "child_services_created": len(new_children),
+        "skipped": skipped,
+    }
+
+
+def export_rows():
+    """
+    Catalog rows in FIELDS order, streamed from the database
+    (main services without children come out with empty child columns).
+    """
+    rows = (
+        MainServices.objects
+        .order_by("gender__name", "main_services_name", "child_services__child_service_name")
+        .values_list(
+            "gender__name",
+            "main_services_name",
+            "main_services_description",
+            "child_services__child_service_name",
+            "child_services__child_service_description",
+            "child_services__price",
+            "child_services__duration",
+        )
+    )
+    for gender, main, main_desc, child, child_desc, price, duration in rows.iterator(chunk_size=500):
+        yield [gender, main, main_desc or "", child or "", child_desc or "",
+               "" if price is None else str(price), "" if duration is None else duration]
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def export_csv():
+    """
+    CSV lines (header first) for StreamingHttpResponse.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(FIELDS)
+    for row in export_rows():
+        yield writer.writerow(row)
+
+
+def export_json():
+    """
+    A JSON array of row objects, produced chunk by chunk.
+    """
+    yield "["
+    for i, row in enumerate(export_rows()):
+        yield ("," if i else "") + json.dumps(dict(zip(FIELDS, row)))
+    yield "]"
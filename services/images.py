@@ -0,0 +1,154 @@
+# services/images.py
+import hashlib
+import logging
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from kombu.exceptions import OperationalError
+from PIL import Image, ImageOps
+
+from .models import Child_services
+from backend.conditional import bump
+
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = "services/variants"
+# Set for a minute after the broker refused a task, so catalog requests
+# don't each wait on the connection
+BROKER_DOWN_KEY = "services:image-variants:broker-down"
+QUEUED_SECONDS = 600
+FORMATS = {
+    # key in image_variants -> (Pillow format, extension, save options)
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+}
+
+
+def _widths():
+    return getattr(settings, "SERVICE_IMAGE_WIDTHS", (320, 640, 1280))
+
+
+def _flatten(img):
+    # JPEG has no alpha; paste transparent uploads onto white
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    return img.convert("RGB")
+
+
+def build_variants(child):
+    """
+    Resize child.image to every configured width (never upscaling) in JPEG
+    and WebP. Files are named after the source content hash, so a URL never
+    changes meaning and can be cached forever; existing files are reused.
+
+    Returns the image_variants dict and stores it on the row, unless the
+    image was replaced meanwhile.
+    """
+    source_name = child.image.name
+    with child.image.open("rb") as fh:
+        data = fh.read()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+
+    with Image.open(BytesIO(data)) as original:
+        img = _flatten(ImageOps.exif_transpose(original))
+
+    widths = sorted({min(w, img.width) for w in _widths()})
+    variants = {"source": source_name, "width": img.width}
+
+    for key, (fmt, ext, options) in FORMATS.items():
+        files = {}
+        for width in widths:
+            name = f"{VARIANT_DIR}/{digest}/{width}.{ext}"
+            if not default_storage.exists(name):
+                height = round(img.height * width / img.width)
+                resized = img.resize((width, height), Image.LANCZOS) if width < img.width else img
+                buf = BytesIO()
+                resized.save(buf, fmt, **options)
+                name = default_storage.save(name, ContentFile(buf.getvalue()))
+            files[str(width)] = name
+        variants[key] = files
+
+    if Child_services.objects.filter(pk=child.pk, image=source_name).update(image_variants=variants):
+        bump("catalog")  # srcsets changed
+    child.image_variants = variants
+    return variants
+
+
+def current_variants(child):
+    """
+    Stored variants if they belong to the current image, else None.
+    """
+    variants = child.image_variants or {}
+    if child.image and variants.get("source") == child.image.name and not variants.get("failed"):
+        return variants
+    return None
+
+
+def variants_failed(child):
+    """
+    True if building variants for the current image already failed
+    (missing or corrupt file); nothing retries until a new upload.
+    """
+    variants = child.image_variants or {}
+    return bool(child.image) and variants.get("source") == child.image.name and bool(variants.get("failed"))
+
+
+def mark_failed(child):
+    source_name = child.image.name
+    failed = {"source": source_name, "failed": True}
+    Child_services.objects.filter(pk=child.pk, image=source_name).update(image_variants=failed)
+    child.image_variants = failed
+
+
+def srcset(variants, key, build_url):
+    """
+    "url 320w, url 640w" for one format of an image_variants dict.
+    """
+    files = variants.get(key) or {}
+    return ", ".join(
+        f"{build_url(default_storage.url(name))} {width}w"
+        for width, name in sorted(files.items(), key=lambda item: int(item[0]))
+    )
+
+
+def image_srcset(child, build_url):
+    """
+    The `image_srcset` field of a child service, the same in every API:
+    {"jpeg": "url 320w, ...", "webp": "..."}, or None (clients use `image`)
+    until the variants exist. A miss queues their generation.
+    """
+    variants = current_variants(child)
+    if not variants:
+        if child.image and not variants_failed(child):
+            queue_variants(child.pk, child.image.name)
+        return None
+    return {key: srcset(variants, key, build_url) for key in FORMATS}
+
+
+def queue_variants(child_id, image_name):
+    """
+    Hand variant generation for one image to celery. Called via
+    transaction.on_commit after an upload, and by the serializer when a
+    request finds the variants missing; each image is queued once per
+    QUEUED_SECONDS per process. Until the variants exist the original
+    image is served.
+    """
+    queued_key = f"services:image-variants:{child_id}:{image_name}"
+    if cache.get(BROKER_DOWN_KEY) or not cache.add(queued_key, 1, QUEUED_SECONDS):
+        return
+
+    from .tasks import generate_image_variants
+    try:
+        generate_image_variants.apply_async((child_id,), retry=False)
+    except OperationalError:
+        # Broker down: a later request, or the hourly sweep, queues it again
+        cache.delete(queued_key)
+        cache.set(BROKER_DOWN_KEY, 1, 60)
+        logger.warning("Could not queue image variants for service %s", child_id, exc_info=True)
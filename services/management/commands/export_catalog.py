@@ -0,0 +1,16 @@
+# services/management/commands/export_catalog.py
+from django.core.management.base import BaseCommand
+
+from services.catalog_io import export_csv, export_json
+
+
+class Command(BaseCommand):
+    help = "Write the service catalog as CSV (default) or JSON to stdout"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--type", choices=["csv", "json"], default="csv")
+
+    def handle(self, *args, **options):
+        chunks = export_json() if options["type"] == "json" else export_csv()
+        for chunk in chunks:
+            self.stdout.write(chunk, ending="")
@@ -0,0 +1,36 @@
+# services/management/commands/import_catalog.py
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.catalog_io import CatalogImportError, import_catalog, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import main/child services from a CSV or JSON file (all rows or nothing)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--skip-existing", action="store_true",
+                            help="Ignore child services that already exist instead of failing")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        file_type = "csv" if path.suffix.lower() == ".csv" else "json"
+        try:
+            rows = read_rows(path.read_bytes(), file_type)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+        try:
+            result = import_catalog(rows, skip_existing=options["skip_existing"])
+        except CatalogImportError as exc:
+            for error in exc.errors:
+                self.stderr.write(f"row {error['row']}: {error['errors']}")
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['main_services_created']} main and "
+            f"{result['child_services_created']} child services "
+            f"({result['skipped']} skipped)"
+        ))
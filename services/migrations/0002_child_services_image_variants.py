@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='child_services',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
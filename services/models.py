@@ -33,6 +33,8 @@ class Child_services(models.Model):
     child_service_description = models.TextField(blank=True, null=True)
     price = models.DecimalField(max_digits=8, decimal_places=2)
     image = models.ImageField(upload_to='services/', blank=True, null=True)
+    # Resized JPEG/WebP copies of `image`, see services/images.py
+    image_variants = models.JSONField(default=dict, blank=True)
     duration = models.PositiveIntegerField(default=30)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,204 @@
+# services/search.py
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from backend.conditional import versions
+
+from .models import Child_services
+
+
+TOKEN_RE = re.compile(r"\w+")
+
+# How much a hit in each field counts
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "main_service": 2.0,
+    "gender": 1.0,
+    "description": 1.0,
+}
+
+# How much each kind of term match counts
+EXACT, PREFIX, TYPO = 1.0, 0.7, 0.5
+
+MIN_TYPO_LENGTH = 4  # shorter terms only match exactly / by prefix
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def _deletes(token):
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _within_one_edit(a, b):
+    """
+    True if a and b differ by one insertion, deletion, substitution or
+    adjacent transposition.
+    """
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diff = [i for i in range(la) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+    if la > lb:
+        a, b = b, a
+    # b is a with one extra character
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over child services.
+
+    postings: token -> {doc index: best field weight}
+    vocabulary: sorted tokens, for prefix lookups with bisect
+    deletes: token with one character removed -> tokens, for typo lookups
+    (symmetric delete: two words within one edit share a key)
+    """
+
+    def __init__(self, rows):
+        self.version = None  # "catalog" version it was built at (get_index)
+        self.docs = []
+        self.postings = defaultdict(dict)
+
+        for row in rows:
+            doc_index = len(self.docs)
+            self.docs.append(row)
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(row[field]):
+                    postings = self.postings[token]
+                    postings[doc_index] = max(postings.get(doc_index, 0), weight)
+
+        self.vocabulary = sorted(self.postings)
+        self.deletes = defaultdict(set)
+        for token in self.vocabulary:
+            if len(token) >= MIN_TYPO_LENGTH - 1:
+                self.deletes[token].add(token)
+                for key in _deletes(token):
+                    self.deletes[key].add(token)
+
+    @classmethod
+    def build(cls):
+        rows = Child_services.objects.values_list(
+            "id",
+            "child_service_name",
+            "child_service_description",
+            "price",
+            "duration",
+            "main_services_id",
+            "main_services__main_services_name",
+            "main_services__gender__name",
+        )
+        return cls([
+            {
+                "id": pk,
+                "name": name,
+                "description": description or "",
+                "price": str(price),
+                "duration": duration,
+                "main_service_id": main_id,
+                "main_service": main_name,
+                "gender": gender or "",
+            }
+            for pk, name, description, price, duration, main_id, main_name, gender in rows
+        ])
+
+    def _term_matches(self, term):
+        """
+        {token: match factor} for one query term: exact, prefix and typo hits.
+        """
+        matches = {}
+
+        start = bisect_left(self.vocabulary, term)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            matches[token] = EXACT if token == term else PREFIX
+
+        if len(term) >= MIN_TYPO_LENGTH:
+            candidates = set(self.deletes.get(term, ()))
+            for key in _deletes(term):
+                candidates |= self.deletes.get(key, set())
+            for token in candidates:
+                if token not in matches and _within_one_edit(term, token):
+                    matches[token] = TYPO
+
+        return matches
+
+    def search(self, query, gender=None, limit=20):
+        """
+        Ranked docs matching every term of `query`, best first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for token, factor in self._term_matches(term).items():
+                for doc_index, weight in self.postings[token].items():
+                    score = factor * weight
+                    if score > term_scores.get(doc_index, 0):
+                        term_scores[doc_index] = score
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                return []
+
+        if gender:
+            gender = gender.lower()
+            scores = {d: s for d, s in scores.items() if self.docs[d]["gender"].lower() == gender}
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.docs[item[0]]["name"].lower()))
+        return [
+            {**self.docs[doc_index], "score": round(score, 2)}
+            for doc_index, score in ranked[:limit]
+        ]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Process-wide search index, built on first use and rebuilt when the
+    "catalog" version moves, so edits and imports made by any process
+    (which bump it) reach every worker.
+    """
+    global _index
+    version = versions("catalog")
+    index = _index
+    if index is None or index.version != version:
+        with _lock:
+            if _index is None or _index.version != version:
+                _index = SearchIndex.build()
+                _index.version = version
+            index = _index
+    return index
+
+
+def invalidate_index():
+    """
+    Wired to catalog post_save/post_delete in services.signals; also called
+    after bulk imports, which skip signals. Both also bump "catalog" for
+    the other processes.
+    """
+    global _index
+    with _lock:
+        _index = None
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Gender, MainServices, Child_services
+from .images import image_srcset
 
 # -------------------------
 # Gender (simple)
@@ -34,6 +35,7 @@ class ChildServiceSerializer(serializers.ModelSerializer):
     main_service_name = serializers.CharField(source='main_services.main_services_name', read_only=True)
     gender = serializers.CharField(source='gender.name', read_only=True)
     image = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Child_services
@@ -44,6 +46,7 @@ class ChildServiceSerializer(serializers.ModelSerializer):
             'price',
             'duration',
             'image',
+            'image_srcset',
             'main_service',
             'main_service_name',
             'gender',
@@ -55,6 +58,10 @@ class ChildServiceSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.image.url)
         return None
 
+    def get_image_srcset(self, obj):
+        # {"jpeg": "...320w, ...640w", "webp": ...}; None until the variants exist
+        return image_srcset(obj, self.context.get('request').build_absolute_uri)
+
     def validate_price(self, value):
         if value is None:
             raise serializers.ValidationError("Price is required.")
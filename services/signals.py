@@ -0,0 +1,18 @@
+# services/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Gender, MainServices, Child_services
+from .search import invalidate_index
+from backend.conditional import bump
+
+
+@receiver(post_save, sender=Child_services)
+@receiver(post_delete, sender=Child_services)
+@receiver(post_save, sender=MainServices)
+@receiver(post_delete, sender=MainServices)
+@receiver(post_save, sender=Gender)
+@receiver(post_delete, sender=Gender)
+def catalog_changed(sender, **kwargs):
+    invalidate_index()
+    bump("catalog")
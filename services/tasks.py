@@ -0,0 +1,37 @@
+from celery import shared_task
+
+from .models import Child_services
+from .images import build_variants, current_variants, mark_failed, variants_failed
+
+
+def _build(child):
+    try:
+        build_variants(child)
+    except (OSError, ValueError):
+        # Missing/corrupt file: recorded so it is not retried until a new upload
+        mark_failed(child)
+        return False
+    return True
+
+
+@shared_task
+def generate_image_variants(child_id):
+    child = Child_services.objects.filter(pk=child_id).first()
+    if not child or not child.image:
+        return
+    if current_variants(child) is None and not variants_failed(child):
+        _build(child)
+
+
+@shared_task
+def generate_missing_image_variants():
+    """
+    Safety net for images whose task could not be queued (broker down).
+    Images that already failed are skipped.
+    """
+    built = 0
+    children = Child_services.objects.exclude(image="").exclude(image__isnull=True)
+    for child in children.only("id", "image", "image_variants"):
+        if current_variants(child) is None and not variants_failed(child):
+            built += _build(child)
+    return f"Built variants for {built} services"
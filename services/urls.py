@@ -10,6 +10,11 @@ from .views import (
     UserMainServicesByGenderView,
     UserChildServicesView,
     UserSingleChildServiceView,
+    UserServiceSearchView,
+    UserCatalogTreeView,
+    # bulk
+    AdminCatalogImportView,
+    AdminCatalogExportView,
     # optional: GenderView (admin single/list) - if you still want
 )
 
@@ -25,10 +30,16 @@ urlpatterns = [
     path('admin/main/<int:main_service_id>/child/', AdminChildServiceView.as_view(), name='admin_child_list_create'),
     path('admin/main/<int:main_service_id>/child/<int:child_id>/', AdminChildServiceDetailView.as_view(), name='admin_child_detail'),
 
+    # ---------------- ADMIN bulk catalog ----------------
+    path('admin/catalog/import/', AdminCatalogImportView.as_view(), name='admin_catalog_import'),
+    path('admin/catalog/export/', AdminCatalogExportView.as_view(), name='admin_catalog_export'),
+
     # ---------------- USER public endpoints ----------------
     path('user/genders/', UserGenderListView.as_view(), name='user_genders'),
     path('user/main/', UserMainServicesByGenderView.as_view(), name='user_main_by_gender'),
     path('user/main/<int:main_service_id>/child/', UserChildServicesView.as_view(), name='user_child_services'),
     path('user/child/<int:child_id>/', UserSingleChildServiceView.as_view(), name='user_single_child'),
+    path('user/search/', UserServiceSearchView.as_view(), name='user_service_search'),
+    path('user/catalog/', UserCatalogTreeView.as_view(), name='user_catalog_tree'),
 ]
 
@@ -1,9 +1,15 @@
+import json
+
+from django.db.models import Prefetch
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from backend.conditional import conditional_get
 from rest_framework.views import APIView
 from rest_framework import status, parsers
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from accounts.permissions import IsAdmin
+from django.db import transaction
 from django.db.models.deletion import ProtectedError
 from .models import Gender, MainServices, Child_services
 from .serializers import (
@@ -11,6 +17,9 @@ from .serializers import (
     MainServicesSerializer,
     ChildServiceSerializer
 )
+from .images import image_srcset, queue_variants
+from .search import get_index
+from .catalog_io import CatalogImportError, export_csv, export_json, import_catalog, read_rows
 
 
 # -------------------------
@@ -19,6 +28,7 @@ from .serializers import (
 class UserGenderListView(APIView):
     permission_classes = [AllowAny]
  
+    @conditional_get("catalog")
     def get(self, request):
         genders = Gender.objects.all()
         serializer = GenderSerializer(genders, many=True)
@@ -28,6 +38,7 @@ class UserGenderListView(APIView):
 class UserMainServicesByGenderView(APIView):
     permission_classes = [AllowAny]
 
+    @conditional_get("catalog")
     def get(self, request):
         gender_id = request.query_params.get('gender_id')
         if not gender_id:
@@ -44,6 +55,7 @@ class UserMainServicesByGenderView(APIView):
 class UserChildServicesView(APIView):
     permission_classes = [AllowAny]
 
+    @conditional_get("catalog")
     def get(self, request, main_service_id):
         children = Child_services.objects.filter(main_services_id=main_service_id).select_related('main_services', 'gender')
         if not children.exists():
@@ -55,12 +67,95 @@ class UserChildServicesView(APIView):
 class UserSingleChildServiceView(APIView):
     permission_classes = [AllowAny]
 
+    @conditional_get("catalog")
     def get(self, request, child_id):
         child = get_object_or_404(Child_services, pk=child_id)
         serializer = ChildServiceSerializer(child, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+def catalog_tree(build_url, gender_id=None):
+    """
+    Genders -> main services -> child services as plain dicts/lists,
+    from one query plus two prefetch queries. `build_url` makes media URLs absolute.
+    """
+    genders = Gender.objects.order_by('id').prefetch_related(
+        Prefetch('main_services', queryset=MainServices.objects.order_by('id')),
+        Prefetch('main_services__child_services', queryset=Child_services.objects.order_by('id')),
+    )
+    if gender_id:
+        genders = genders.filter(pk=gender_id)
+
+    return [
+        {
+            "id": gender.id,
+            "name": gender.name,
+            "main_services": [
+                {
+                    "id": main.id,
+                    "main_services_name": main.main_services_name,
+                    "main_services_description": main.main_services_description,
+                    "child_services": [_child_node(child, build_url) for child in main.child_services.all()],
+                }
+                for main in gender.main_services.all()
+            ],
+        }
+        for gender in genders
+    ]
+
+
+def _child_node(child, build_url):
+    return {
+        "id": child.id,
+        "child_service_name": child.child_service_name,
+        "child_service_description": child.child_service_description,
+        "price": str(child.price),
+        "duration": child.duration,
+        "image": build_url(child.image.url) if child.image else None,
+        "image_srcset": image_srcset(child, build_url),  # same {jpeg, webp} shape as ChildServiceSerializer
+    }
+
+
+class UserCatalogTreeView(APIView):
+    """
+    GET ?gender_id=<id>: the whole catalog in one response instead of the
+    genders -> main -> child request waterfall. Compressed by
+    ThresholdGZipMiddleware; ETag from the catalog version counter.
+    """
+    permission_classes = [AllowAny]
+
+    @conditional_get("catalog")
+    def get(self, request):
+        gender_id = request.query_params.get('gender_id')
+        if gender_id and not gender_id.isdigit():
+            return Response({"error": "gender_id must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+        body = json.dumps({"genders": catalog_tree(request.build_absolute_uri, gender_id)}, separators=(',', ':'))
+        return HttpResponse(body, content_type='application/json')
+
+
+class UserServiceSearchView(APIView):
+    """
+    GET ?q=<text>&gender=<name>&limit=<n>
+    Prefix and typo tolerant search over child service name/description,
+    main service and gender; best matches first.
+    """
+    permission_classes = [AllowAny]
+
+    @conditional_get("catalog")
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({"error": "limit must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = get_index().search(query, gender=request.query_params.get('gender'), limit=limit)
+        return Response({"query": query, "count": len(results), "results": results}, status=status.HTTP_200_OK)
+
+
 # -------------------------
 # ADMIN: MAIN SERVICES CRUD
 # -------------------------
@@ -193,6 +288,8 @@ class AdminChildServiceView(APIView):
                 duration=serializer.validated_data.get('duration', 30),
                 image=request.FILES.get('image')  # MultiPartParser supports file
             )
+            if child.image:
+                transaction.on_commit(lambda: queue_variants(child.id, child.image.name))
             return Response({"message": "Child service created successfully",
                              "data": ChildServiceSerializer(child, context={'request': request}).data},
                             status=status.HTTP_201_CREATED)
@@ -226,6 +323,8 @@ class AdminChildServiceDetailView(APIView):
             if 'image' in request.FILES:
                 child.image = request.FILES['image']
             child.save()
+            if 'image' in request.FILES:
+                transaction.on_commit(lambda: queue_variants(child.id, child.image.name))
             return Response(
                 {"message": "Child service updated",
                  "data": ChildServiceSerializer(child, context={'request': request}).data},
@@ -244,6 +343,8 @@ class AdminChildServiceDetailView(APIView):
             if 'image' in request.FILES:
                 child.image = request.FILES['image']
             child.save()
+            if 'image' in request.FILES:
+                transaction.on_commit(lambda: queue_variants(child.id, child.image.name))
             return Response(
                 {"message": "Child service partially updated",
                  "data": ChildServiceSerializer(child, context={'request': request}).data},
@@ -263,4 +364,54 @@ class AdminChildServiceDetailView(APIView):
             )
 
 
+# -------------------------
+# ADMIN: BULK CATALOG IMPORT / EXPORT
+# -------------------------
+class AdminCatalogImportView(APIView):
+    """
+    POST rows as JSON (list or {"rows": [...]}) or upload a .csv/.json as `file`.
+    The whole batch is validated first; nothing is written if any row fails.
+    ?skip_existing=true ignores child services that already exist.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    parser_classes = [parsers.JSONParser, parsers.MultiPartParser]
 
+    def post(self, request):
+        upload = request.FILES.get('file')
+        try:
+            if upload:
+                file_type = 'csv' if upload.name.lower().endswith('.csv') else 'json'
+                rows = read_rows(upload.read(), file_type)
+            else:
+                rows = request.data
+                if isinstance(rows, dict):
+                    rows = rows.get('rows', [])
+        except (ValueError, UnicodeDecodeError):
+            return Response({"error": "Could not parse the uploaded file"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not isinstance(rows, list) or not rows:
+            return Response({"error": "No rows to import"}, status=status.HTTP_400_BAD_REQUEST)
+
+        skip_existing = request.query_params.get('skip_existing', '').lower() in ('1', 'true', 'yes')
+        try:
+            result = import_catalog(rows, skip_existing=skip_existing)
+        except CatalogImportError as exc:
+            return Response({"error": "Import rejected", "rows": exc.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"message": "Catalog imported", **result}, status=status.HTTP_201_CREATED)
+
+
+class AdminCatalogExportView(APIView):
+    """
+    GET ?type=csv (default) or ?type=json; streamed, same columns as the import.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        if request.query_params.get('type') == 'json':
+            response = StreamingHttpResponse(export_json(), content_type='application/json')
+            response['Content-Disposition'] = 'attachment; filename="catalog.json"'
+        else:
+            response = StreamingHttpResponse(export_csv(), content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="catalog.csv"'
+        return response